@@ -9,6 +9,7 @@ class Config:
     
     # Database Configuration (Railway)
     DATABASE_URL = os.getenv('DATABASE_URL')
+    DB_POOL_MAX_CONN = int(os.getenv('DB_POOL_MAX_CONN', '10'))
     
     # Helius API Configuration
     HELIUS_API_KEY = os.getenv('HELIUS_API_KEY')
@@ -17,7 +18,7 @@ class Config:
     TOKEN_CONTRACT_ADDRESS = "9M7eYNNP4TdJCmMspKpdbEhvpdds6E5WFVTTLjXfVray"
     
     # Admin Configuration
-    ADMIN_USER_IDS = [int(id.strip()) for id in os.getenv('ADMIN_USER_IDS', '').split(',') if id.strip()]
+    ADMIN_USER_IDS = frozenset(int(id.strip()) for id in os.getenv('ADMIN_USER_IDS', '').split(',') if id.strip())
     
     # Snapshot Configuration
     MINIMUM_USD_THRESHOLD = float(os.getenv('MINIMUM_USD_THRESHOLD', '0'))
@@ -1,26 +1,93 @@
+import io
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 import psycopg2
 import psycopg2.extras
-from datetime import datetime, date
+import psycopg2.pool
+from psycopg2 import sql
+from datetime import datetime, date, timedelta
 from config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds the minimum USD threshold is reused before the settings row is
+# read again; the bot drops it early via invalidate_threshold()
+THRESHOLD_CACHE_TTL = 60
+
+# pg advisory lock key held while a snapshot is written, shared by every
+# process (bot and scheduler each have their own SnapshotService)
+SNAPSHOT_LOCK_KEY = 0x534E4150
+
+def _month_range(day):
+    """First day of day's month and first day of the following month"""
+    start = day.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
 class Database:
+    # Read pool for queries issued concurrently from worker threads. There is
+    # one per process, shared by every Database instance (the bot, snapshot
+    # service and scheduler each construct their own), and closed when the
+    # last of them is closed
+    _pool = None
+    _pool_users = 0
+    _pool_lock = threading.Lock()
+    # getconn() raises instead of waiting when every connection is out,
+    # and handler threads can outnumber the pool, so callers queue here
+    _pool_slots = threading.BoundedSemaphore(Config.DB_POOL_MAX_CONN)
+    # Pooled connections that have holder_with_rank prepared. Weak so a
+    # connection the pool closed drops out rather than leaving an id()
+    # that a new connection could later reuse
+    _prepared_conns = weakref.WeakSet()
+    
     def __init__(self):
         self.conn = None
+        self._ping_prepared = False
+        self._snapshots_partitioned = False
+        self._uses_pool = False
+        # (expires_at, value) for the settings row read on nearly every
+        # command; see get_minimum_usd_threshold()
+        self._threshold_cache = None
         self.connect()
         self.create_tables()
+        with Database._pool_lock:
+            Database._pool_users += 1
+            self._uses_pool = True
     
     def connect(self):
         """Establish database connection"""
         try:
             self.conn = psycopg2.connect(Config.DATABASE_URL)
+            self._ping_prepared = False
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
     
+    def ping(self):
+        """Check the connection is usable, reconnecting if it was dropped"""
+        try:
+            if self.conn is None or self.conn.closed:
+                raise psycopg2.InterfaceError("connection already closed")
+            self._execute_ping()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logger.warning(f"Database ping failed ({e}), reconnecting...")
+            self.connect()
+            self._execute_ping()
+    
+    def _execute_ping(self):
+        """Run the prepared ping statement on the current connection"""
+        with self.conn.cursor() as cursor:
+            # Prepared statements live for the session, so prepare once per connection
+            if not self._ping_prepared:
+                cursor.execute("PREPARE health_ping AS SELECT 1")
+                self._ping_prepared = True
+            cursor.execute("EXECUTE health_ping")
+            cursor.fetchone()
+        self.conn.rollback()
+    
     def create_tables(self):
         """Create necessary tables if they don't exist"""
         try:
@@ -37,18 +104,13 @@ class Database:
                     )
                 """)
                 
-                # Create snapshots table
+                # Create snapshots table, partitioned by month
+                self._create_snapshots_table(cursor, "snapshots")
+                
+                # Retention cleanup selects snapshots by date alone
                 cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS snapshots (
-                        id SERIAL PRIMARY KEY,
-                        wallet_address VARCHAR(44) NOT NULL,
-                        snapshot_date DATE NOT NULL,
-                        token_balance DECIMAL(30, 8) NOT NULL,
-                        usd_value DECIMAL(15, 2),
-                        days_held INTEGER NOT NULL,
-                        FOREIGN KEY (wallet_address) REFERENCES holders(wallet_address),
-                        UNIQUE(wallet_address, snapshot_date)
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_snapshots_snapshot_date
+                    ON snapshots (snapshot_date)
                 """)
                 
                 # Create settings table for admin configuration
@@ -74,11 +136,45 @@ class Database:
                 # Run migrations for existing tables
                 self._run_migrations()
                 
+                # Make sure this month's partition exists before anything writes
+                cursor.execute("SELECT relkind FROM pg_class WHERE oid = 'snapshots'::regclass")
+                self._snapshots_partitioned = cursor.fetchone()[0] == 'p'
+                if self._snapshots_partitioned:
+                    self._ensure_snapshot_partition(cursor, "snapshots", date.today())
+                    self.conn.commit()
+                
         except Exception as e:
             logger.error(f"Error creating tables: {e}")
             self.conn.rollback()
             raise
     
+    def _create_snapshots_table(self, cursor, table_name):
+        """Create the snapshots table, range-partitioned by snapshot_date
+        
+        The partition key has to be part of every unique constraint, so the
+        table has no primary key; (wallet_address, snapshot_date) is unique.
+        """
+        cursor.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {} (
+                id SERIAL,
+                wallet_address VARCHAR(44) NOT NULL,
+                snapshot_date DATE NOT NULL,
+                token_balance DECIMAL(30, 8) NOT NULL,
+                usd_value DECIMAL(15, 2),
+                days_held INTEGER NOT NULL,
+                FOREIGN KEY (wallet_address) REFERENCES holders(wallet_address),
+                UNIQUE(wallet_address, snapshot_date)
+            ) PARTITION BY RANGE (snapshot_date)
+        """).format(sql.Identifier(table_name)))
+    
+    def _ensure_snapshot_partition(self, cursor, table_name, day):
+        """Create the monthly partition of table_name covering day if it is missing"""
+        start, end = _month_range(day)
+        cursor.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {} PARTITION OF {}
+            FOR VALUES FROM (%s) TO (%s)
+        """).format(sql.Identifier(f"snapshots_{start:%Y%m}"), sql.Identifier(table_name)), (start, end))
+    
     def _run_migrations(self):
         """Run database migrations for existing tables"""
         try:
@@ -104,21 +200,67 @@ class Database:
                     self.conn.commit()
                     logger.info("Migration completed successfully")
                 
+                # Move an unpartitioned snapshots table onto monthly partitions
+                cursor.execute("SELECT relkind FROM pg_class WHERE oid = 'snapshots'::regclass")
+                if cursor.fetchone()[0] == 'r':
+                    logger.info("Migrating snapshots to a table partitioned by month")
+                    self._create_snapshots_table(cursor, "snapshots_partitioned")
+                    
+                    cursor.execute("SELECT MIN(snapshot_date), MAX(snapshot_date) FROM snapshots")
+                    first_date, last_date = cursor.fetchone()
+                    month = _month_range(first_date or date.today())[0]
+                    last_month = max(last_date or date.today(), date.today())
+                    while month <= last_month:
+                        self._ensure_snapshot_partition(cursor, "snapshots_partitioned", month)
+                        month = _month_range(month)[1]
+                    
+                    cursor.execute("""
+                        INSERT INTO snapshots_partitioned (wallet_address, snapshot_date, token_balance, usd_value, days_held)
+                        SELECT wallet_address, snapshot_date, token_balance, usd_value, days_held
+                        FROM snapshots
+                    """)
+                    cursor.execute("DROP TABLE snapshots")
+                    cursor.execute("ALTER TABLE snapshots_partitioned RENAME TO snapshots")
+                    cursor.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_snapshots_snapshot_date
+                        ON snapshots (snapshot_date)
+                    """)
+                    self.conn.commit()
+                    logger.info("Snapshots partition migration completed successfully")
+                
         except Exception as e:
             logger.error(f"Error running migrations: {e}")
             self.conn.rollback()
     
     def get_minimum_usd_threshold(self):
-        """Get the minimum USD threshold from settings"""
+        """Get the minimum USD threshold from settings
+        
+        The value is reused for up to THRESHOLD_CACHE_TTL seconds, so edits
+        made outside this process show up after at most that long. Reads
+        use the pool, since callers are often bot worker threads.
+        """
+        cached = self._threshold_cache
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
         try:
-            with self.conn.cursor() as cursor:
-                cursor.execute("SELECT value FROM settings WHERE key = 'minimum_usd_threshold'")
-                result = cursor.fetchone()
-                return float(result[0]) if result else 0
+            with self._pooled_connection() as conn, conn.cursor() as cursor:
+                threshold = self._read_threshold(cursor)
+            self._threshold_cache = (time.monotonic() + THRESHOLD_CACHE_TTL, threshold)
+            return threshold
         except Exception as e:
             logger.error(f"Error getting minimum USD threshold: {e}")
             return 0
     
+    def _read_threshold(self, cursor):
+        """Read the minimum USD threshold with an existing cursor"""
+        cursor.execute("SELECT value FROM settings WHERE key = 'minimum_usd_threshold'")
+        result = cursor.fetchone()
+        return float(result[0]) if result else 0
+    
+    def invalidate_threshold(self):
+        """Forget the cached threshold so the next read hits the database"""
+        self._threshold_cache = None
+    
     def set_minimum_usd_threshold(self, threshold):
         """Set the minimum USD threshold"""
         try:
@@ -128,6 +270,7 @@ class Database:
                     WHERE key = 'minimum_usd_threshold'
                 """, (str(threshold),))
                 self.conn.commit()
+                self._threshold_cache = (time.monotonic() + THRESHOLD_CACHE_TTL, float(threshold))
                 logger.info(f"Minimum USD threshold updated to {threshold}")
                 return True
         except Exception as e:
@@ -171,6 +314,8 @@ class Database:
         """Add a daily snapshot for a holder"""
         try:
             with self.conn.cursor() as cursor:
+                if self._snapshots_partitioned:
+                    self._ensure_snapshot_partition(cursor, "snapshots", date.today())
                 cursor.execute("""
                     INSERT INTO snapshots (wallet_address, snapshot_date, token_balance, usd_value, days_held)
                     VALUES (%s, %s, %s, %s, %s)
@@ -190,6 +335,147 @@ class Database:
             self.conn.rollback()
             return False
     
+    def try_snapshot_lock(self):
+        """Take the snapshot advisory lock; False if another session holds it"""
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (SNAPSHOT_LOCK_KEY,))
+                acquired = cursor.fetchone()[0]
+            self.conn.commit()
+            return acquired
+        except Exception as e:
+            logger.error(f"Error acquiring snapshot lock: {e}")
+            self.conn.rollback()
+            return False
+    
+    def release_snapshot_lock(self):
+        """Release the lock taken by try_snapshot_lock()"""
+        try:
+            # The snapshot has committed or failed by now; clear any aborted
+            # transaction so the unlock itself can run
+            self.conn.rollback()
+            with self.conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (SNAPSHOT_LOCK_KEY,))
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error releasing snapshot lock: {e}")
+            self.conn.rollback()
+    
+    def save_snapshot(self, holder_rows, snapshot_date, days_held):
+        """Upsert holders and record their snapshots in a single transaction
+        
+        holder_rows is a list of (wallet_address, token_balance, usd_value).
+        days_held(first_seen_date, snapshot_date) gives a holder's days held.
+        Returns the number of holders written.
+        """
+        try:
+            with self.conn.cursor() as cursor:
+                # New holders are first seen on the snapshot date; existing ones
+                # keep theirs, which RETURNING hands back for the days held.
+                # Most balances don't change between days, so only rows whose
+                # values changed are rewritten.
+                first_seen = dict(psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO holders (wallet_address, token_balance, usd_value, first_seen_date)
+                    VALUES %s
+                    ON CONFLICT (wallet_address)
+                    DO UPDATE SET
+                        token_balance = EXCLUDED.token_balance,
+                        usd_value = EXCLUDED.usd_value,
+                        last_updated = CURRENT_TIMESTAMP
+                    WHERE (holders.token_balance, holders.usd_value)
+                        IS DISTINCT FROM (EXCLUDED.token_balance, EXCLUDED.usd_value)
+                    RETURNING wallet_address, first_seen_date
+                """, [row + (snapshot_date,) for row in holder_rows], page_size=1000, fetch=True))
+                
+                # Unchanged holders were skipped by the upsert and aren't in
+                # RETURNING; look up their first seen dates in one query
+                unchanged = [row[0] for row in holder_rows if row[0] not in first_seen]
+                if unchanged:
+                    cursor.execute("""
+                        SELECT wallet_address, first_seen_date FROM holders
+                        WHERE wallet_address = ANY(%s)
+                    """, (unchanged,))
+                    first_seen.update(cursor.fetchall())
+                
+                if self._snapshots_partitioned:
+                    self._ensure_snapshot_partition(cursor, "snapshots", snapshot_date)
+                
+                # Stream the snapshot rows into a temp table with COPY, then
+                # merge them so a second snapshot on the same day still upserts
+                buffer = io.StringIO()
+                for wallet_address, token_balance, usd_value in holder_rows:
+                    buffer.write(f"{wallet_address}\t{snapshot_date}\t{token_balance}\t{usd_value}\t"
+                                 f"{days_held(first_seen[wallet_address], snapshot_date)}\n")
+                buffer.seek(0)
+                
+                cursor.execute("""
+                    CREATE TEMP TABLE snapshot_batch (
+                        wallet_address VARCHAR(44),
+                        snapshot_date DATE,
+                        token_balance DECIMAL(30, 8),
+                        usd_value DECIMAL(15, 2),
+                        days_held INTEGER
+                    ) ON COMMIT DROP
+                """)
+                cursor.copy_expert("""
+                    COPY snapshot_batch (wallet_address, snapshot_date, token_balance, usd_value, days_held)
+                    FROM STDIN
+                """, buffer)
+                cursor.execute("""
+                    INSERT INTO snapshots (wallet_address, snapshot_date, token_balance, usd_value, days_held)
+                    SELECT wallet_address, snapshot_date, token_balance, usd_value, days_held
+                    FROM snapshot_batch
+                    ON CONFLICT (wallet_address, snapshot_date) 
+                    DO UPDATE SET 
+                        token_balance = EXCLUDED.token_balance,
+                        usd_value = EXCLUDED.usd_value,
+                        days_held = EXCLUDED.days_held
+                """)
+                
+            self.conn.commit()
+            logger.info(f"Snapshot saved for {len(holder_rows)} holders")
+            return len(holder_rows)
+            
+        except Exception as e:
+            logger.error(f"Error saving snapshot: {e}")
+            self.conn.rollback()
+            raise
+    
+    def drop_snapshot_partitions_before(self, cutoff_date):
+        """Drop monthly snapshot partitions whose rows are all older than cutoff_date
+        
+        Returns the number of snapshot rows dropped.
+        """
+        try:
+            dropped_count = 0
+            with self.conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.relname FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = 'snapshots'::regclass
+                """)
+                for (partition,) in cursor.fetchall():
+                    try:
+                        month = datetime.strptime(partition.rsplit('_', 1)[1], '%Y%m').date()
+                    except ValueError:
+                        continue  # Not one of our monthly partitions
+                    if _month_range(month)[1] > cutoff_date:
+                        continue
+                    
+                    table = sql.Identifier(partition)
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+                    dropped_count += cursor.fetchone()[0]
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(table))
+                    logger.info(f"Dropped snapshot partition {partition}")
+            
+            self.conn.commit()
+            return dropped_count
+            
+        except Exception as e:
+            logger.error(f"Error dropping old snapshot partitions: {e}")
+            self.conn.rollback()
+            return 0
+    
     def get_leaderboard(self, limit=50):
         """Get leaderboard ranked by days held"""
         try:
@@ -235,6 +521,70 @@ class Database:
             logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
             return []
     
+    def get_leaderboard_bundle(self, cursor=None, limit=20):
+        """Get one leaderboard page plus its threshold and holder count
+        
+        Uses keyset pagination: `cursor` is the (days_held, usd_value, id)
+        of the last row on the previous page, or None for the first page.
+        The threshold and total are read in the same statement, so a page
+        costs one round-trip. Returns a dict with 'rows', 'next_cursor'
+        (None on the last page), 'threshold' and 'total_holders'.
+        Database errors are logged and re-raised rather than reported as
+        an empty leaderboard.
+        """
+        try:
+            query = sql.SQL("""
+                WITH params AS (
+                    SELECT COALESCE(
+                        (SELECT value::numeric FROM settings WHERE key = 'minimum_usd_threshold'), 0
+                    ) AS threshold
+                ),
+                ranked_holders AS (
+                    SELECT 
+                        h.id,
+                        h.wallet_address,
+                        h.token_balance,
+                        h.usd_value,
+                        h.first_seen_date,
+                        COALESCE(MAX(s.days_held), 0) as days_held
+                    FROM holders h
+                    LEFT JOIN snapshots s ON h.wallet_address = s.wallet_address
+                    WHERE h.usd_value >= (SELECT threshold FROM params)
+                    GROUP BY h.id
+                )
+                SELECT r.*, p.threshold, (SELECT COUNT(*) FROM ranked_holders) AS total_holders
+                FROM ranked_holders r CROSS JOIN params p
+                {where}
+                ORDER BY r.days_held DESC, r.usd_value DESC, r.id DESC
+                LIMIT %s
+            """)
+            if cursor is None:
+                query = query.format(where=sql.SQL(""))
+                params = (limit + 1,)
+            else:
+                query = query.format(where=sql.SQL("WHERE (r.days_held, r.usd_value, r.id) < (%s, %s, %s)"))
+                params = (*cursor, limit + 1)
+            
+            with self._pooled_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                    cur.execute(query, params)
+                    rows = cur.fetchall()
+            
+            bundle = {'rows': rows, 'next_cursor': None, 'threshold': 0, 'total_holders': 0}
+            if rows:
+                bundle['threshold'] = float(rows[0]['threshold'])
+                bundle['total_holders'] = rows[0]['total_holders']
+            # The extra row only tells us whether another page exists
+            if len(rows) > limit:
+                bundle['rows'] = rows = rows[:limit]
+                last = rows[-1]
+                bundle['next_cursor'] = (last['days_held'], last['usd_value'], last['id'])
+            return bundle
+            
+        except Exception as e:
+            logger.error(f"Error getting leaderboard bundle: {e}")
+            raise
+    
     def get_holder_rank(self, wallet_address):
         """Get the rank of a specific holder"""
         try:
@@ -247,11 +597,11 @@ class Database:
                         SELECT 
                             h.wallet_address,
                             COALESCE(MAX(s.days_held), 0) as days_held,
-                            ROW_NUMBER() OVER (ORDER BY COALESCE(MAX(s.days_held), 0) DESC, h.usd_value DESC) as rank
+                            ROW_NUMBER() OVER (ORDER BY COALESCE(MAX(s.days_held), 0) DESC, h.usd_value DESC, h.id DESC) as rank
                         FROM holders h
                         LEFT JOIN snapshots s ON h.wallet_address = s.wallet_address
                         WHERE h.usd_value >= %s
-                        GROUP BY h.wallet_address, h.usd_value
+                        GROUP BY h.id
                     )
                     SELECT rank, days_held FROM ranked_holders WHERE wallet_address = %s
                 """, (threshold, wallet_address))
@@ -278,6 +628,82 @@ class Database:
             logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
             return (None, 0)
     
+    def _get_pool(self):
+        """Create the read connection pool on first use
+        
+        minconn equals maxconn: ThreadedConnectionPool closes any returned
+        connection beyond minconn, so a smaller minimum would reconnect on
+        most concurrent reads.
+        """
+        with Database._pool_lock:
+            if Database._pool is None:
+                Database._pool = psycopg2.pool.ThreadedConnectionPool(
+                    Config.DB_POOL_MAX_CONN, Config.DB_POOL_MAX_CONN, Config.DATABASE_URL
+                )
+                logger.info(f"Database read pool created (max {Config.DB_POOL_MAX_CONN} connections)")
+            return Database._pool
+    
+    @contextmanager
+    def _pooled_connection(self):
+        """Borrow a read-pool connection for concurrent bot queries
+        
+        Blocks while all DB_POOL_MAX_CONN connections are borrowed. The
+        connection's transaction is rolled back before it is returned; if
+        the block raised it is closed instead, since its state is unknown.
+        """
+        with self._pool_slots:
+            pool = self._get_pool()
+            conn = pool.getconn()
+            try:
+                yield conn
+                conn.rollback()
+            except Exception:
+                self._prepared_conns.discard(conn)
+                pool.putconn(conn, close=True)
+                raise
+            else:
+                pool.putconn(conn)
+    
+    def get_holder_with_rank(self, wallet_address):
+        """Get rank and details of a holder in one query
+        
+        Runs on a pooled connection so concurrent /rank calls don't share
+        a socket; the statement is prepared once per pooled connection.
+        Returns (rank, days_held, token_balance, usd_value, first_seen_date),
+        or None if the wallet is not on the leaderboard; database errors
+        are logged and re-raised.
+        """
+        try:
+            with self._pooled_connection() as conn, conn.cursor() as cursor:
+                if conn not in self._prepared_conns:
+                    cursor.execute("""
+                        PREPARE holder_with_rank(varchar) AS
+                        WITH ranked_holders AS (
+                            SELECT 
+                                h.wallet_address,
+                                h.token_balance,
+                                h.usd_value,
+                                h.first_seen_date,
+                                COALESCE(MAX(s.days_held), 0) as days_held,
+                                ROW_NUMBER() OVER (ORDER BY COALESCE(MAX(s.days_held), 0) DESC, h.usd_value DESC, h.id DESC) as rank
+                            FROM holders h
+                            LEFT JOIN snapshots s ON h.wallet_address = s.wallet_address
+                            WHERE h.usd_value >= COALESCE(
+                                (SELECT value::numeric FROM settings WHERE key = 'minimum_usd_threshold'), 0
+                            )
+                            GROUP BY h.id
+                        )
+                        SELECT rank, days_held, token_balance, usd_value, first_seen_date
+                        FROM ranked_holders WHERE wallet_address = $1
+                    """)
+                    self._prepared_conns.add(conn)
+                cursor.execute("EXECUTE holder_with_rank(%s)", (wallet_address,))
+                return cursor.fetchone()
+                
+        except Exception as e:
+            logger.error(f"Error getting holder with rank: {e}")
+            raise
+    
     def get_total_holders(self):
         """Get total number of holders above threshold"""
         try:
@@ -303,11 +729,14 @@ class Database:
             return 0
     
     def get_bot_stats(self):
-        """Get comprehensive bot statistics"""
+        """Get comprehensive bot statistics (runs on a pooled connection)
+        
+        Database errors are logged and re-raised rather than shown as zeros.
+        """
         try:
             stats = {}
             
-            with self.conn.cursor() as cursor:
+            with self._pooled_connection() as conn, conn.cursor() as cursor:
                 # Total holders
                 cursor.execute("SELECT COUNT(*) FROM holders")
                 stats['total_holders'] = cursor.fetchone()[0]
@@ -322,7 +751,7 @@ class Database:
                 stats['last_snapshot'] = last_snapshot.strftime('%Y-%m-%d %H:%M') if last_snapshot else 'Never'
                 
                 # Min USD threshold
-                stats['min_usd_threshold'] = self.get_minimum_usd_threshold()
+                stats['min_usd_threshold'] = self._read_threshold(cursor)
                 
                 # Database size (approximate)
                 cursor.execute("""
@@ -335,13 +764,7 @@ class Database:
             
         except Exception as e:
             logger.error(f"Error getting bot stats: {e}")
-            return {
-                'total_holders': 0,
-                'total_snapshots': 0,
-                'last_snapshot': 'Error',
-                'min_usd_threshold': 0.0,
-                'db_size': 'Unknown'
-            }
+            raise
     
     def get_first_seen_date(self, wallet_address):
         """Get the first seen date for a wallet address"""
@@ -362,6 +785,14 @@ class Database:
     
     def close(self):
         """Close database connection"""
-        if self.conn:
+        if self._uses_pool:
+            self._uses_pool = False
+            with Database._pool_lock:
+                Database._pool_users -= 1
+                if Database._pool_users == 0 and Database._pool is not None:
+                    Database._pool.closeall()
+                    Database._pool = None
+                    Database._prepared_conns.clear()
+        if self.conn and not self.conn.closed:
             self.conn.close()
             logger.info("Database connection closed")
@@ -8,6 +8,9 @@ Provides health status endpoints for Railway deployment monitoring.
 import logging
 import psutil
 import os
+import threading
+import time
+import orjson
 from datetime import datetime
 from database import Database
 from helius_api import HeliusAPI
@@ -15,11 +18,17 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Seconds a health report is reused; each one samples CPU for a second and
+# queries the database and Helius
+HEALTH_CACHE_TTL = 5
+
 class HealthChecker:
     def __init__(self):
         self.db = None
         self.helius = None
         self.start_time = datetime.now()
+        self._cached = None
+        self._cache_lock = threading.Lock()
     
     def get_system_health(self):
         """Get system health metrics"""
@@ -66,10 +75,8 @@ class HealthChecker:
             if not self.db:
                 self.db = Database()
             
-            # Test database connection
-            with self.db.conn.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
+            # Test database connection (reconnects if it was dropped)
+            self.db.ping()
             
             # Get basic stats
             total_holders = self.db.get_total_holders()
@@ -118,7 +125,22 @@ class HealthChecker:
             }
     
     def get_overall_health(self):
-        """Get overall health status"""
+        """Get overall health status, reusing it for up to HEALTH_CACHE_TTL seconds
+        
+        Concurrent callers wait for the probe already in progress instead of
+        starting their own.
+        """
+        with self._cache_lock:
+            cached = self._cached
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+            
+            health = self._check_overall_health()
+            self._cached = (time.monotonic() + HEALTH_CACHE_TTL, health)
+            return health
+    
+    def _check_overall_health(self):
+        """Run all health probes"""
         system_health = self.get_system_health()
         db_health = self.get_database_health()
         api_health = self.get_api_health()
@@ -154,8 +176,7 @@ def get_health_status():
 
 def get_health_json():
     """Get health status as JSON string"""
-    import json
-    return json.dumps(get_health_status(), indent=2)
+    return orjson.dumps(get_health_status(), option=orjson.OPT_INDENT_2).decode()
 
 if __name__ == "__main__":
     # Test health checker
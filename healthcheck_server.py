@@ -5,193 +5,230 @@ Health Check HTTP Server for Token Holder Bot
 Provides HTTP endpoints for Railway health monitoring.
 """
 
-import http.server
-import socketserver
-import json
+import hashlib
 import logging
 import os
+import socket
 import time
 from datetime import datetime
-from urllib.parse import urlparse
+
+import orjson
+from aiohttp import web
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class HealthCheckHandler(http.server.BaseHTTPRequestHandler):
-    def do_GET(self):
-        """Handle GET requests"""
-        try:
-            parsed_url = urlparse(self.path)
-            path = parsed_url.path
-            
-            if path == "/health":
-                self._handle_health_check()
-            elif path == "/":
-                self._handle_root()
-            elif path == "/ping":
-                self._handle_ping()
-            else:
-                self._handle_not_found()
-                
-        except Exception as e:
-            logger.error(f"Error handling request: {e}")
-            self._send_error_response(500, "Internal Server Error")
+# Static dashboard page, encoded once at import
+_ROOT_BODY = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Token Holder Bot - Health Status</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .status { padding: 10px; margin: 10px 0; border-radius: 5px; }
+        .healthy { background-color: #d4edda; color: #155724; }
+        .warning { background-color: #fff3cd; color: #856404; }
+        .unhealthy { background-color: #f8d7da; color: #721c24; }
+        .endpoint { background-color: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <h1>🏥 Token Holder Bot Health Status</h1>
+    <p>This service provides health monitoring for the Token Holder Bot.</p>
     
-    def _handle_health_check(self):
-        """Handle /health endpoint"""
-        try:
-            # Simple health check that doesn't depend on other modules
-            health_data = {
-                "status": "healthy",
-                "timestamp": datetime.now().isoformat(),
-                "service": "Token Holder Bot",
-                "uptime": "running",
-                "components": {
-                    "http_server": "healthy",
-                    "timestamp": datetime.now().isoformat()
-                }
-            }
-            
-            # Set response headers
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            # Send response
-            response = json.dumps(health_data, indent=2)
-            self.wfile.write(response.encode('utf-8'))
-            
-            logger.info(f"Health check request - Status: {health_data['status']}")
-            
-        except Exception as e:
-            logger.error(f"Error in health check: {e}")
-            self._send_error_response(500, "Health check failed")
+    <div class="endpoint">
+        <h3>📊 Health Check Endpoint</h3>
+        <p><strong>GET /health</strong> - Returns comprehensive health status</p>
+        <p>Use this endpoint for Railway health monitoring.</p>
+    </div>
     
-    def _handle_root(self):
-        """Handle root endpoint"""
-        try:
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html')
-            self.end_headers()
-            
-            html_content = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Token Holder Bot - Health Status</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 40px; }
-                    .status { padding: 10px; margin: 10px 0; border-radius: 5px; }
-                    .healthy { background-color: #d4edda; color: #155724; }
-                    .warning { background-color: #fff3cd; color: #856404; }
-                    .unhealthy { background-color: #f8d7da; color: #721c24; }
-                    .endpoint { background-color: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; }
-                </style>
-            </head>
-            <body>
-                <h1>🏥 Token Holder Bot Health Status</h1>
-                <p>This service provides health monitoring for the Token Holder Bot.</p>
-                
-                <div class="endpoint">
-                    <h3>📊 Health Check Endpoint</h3>
-                    <p><strong>GET /health</strong> - Returns comprehensive health status</p>
-                    <p>Use this endpoint for Railway health monitoring.</p>
-                </div>
-                
-                <div class="endpoint">
-                    <h3>🔍 Current Status</h3>
-                    <div id="current-status">Loading...</div>
-                </div>
-                
-                <script>
-                    // Fetch current health status
-                    fetch('/health')
-                        .then(response => response.json())
-                        .then(data => {
-                            const statusDiv = document.getElementById('current-status');
-                            const statusClass = data.status === 'healthy' ? 'healthy' : 
-                                              data.status === 'warning' ? 'warning' : 'unhealthy';
-                            
-                            statusDiv.innerHTML = `
-                                <div class="status ${statusClass}">
-                                    <strong>Overall Status:</strong> ${data.status.toUpperCase()}<br>
-                                    <strong>Timestamp:</strong> ${data.timestamp}<br>
-                                    <strong>Service:</strong> ${data.service}<br>
-                                    <strong>Uptime:</strong> ${data.uptime}
-                                </div>
-                            `;
-                        })
-                        .catch(error => {
-                            document.getElementById('current-status').innerHTML = 
-                                '<div class="status unhealthy">Error fetching status</div>';
-                        });
-                </script>
-            </body>
-            </html>
-            """
-            
-            self.wfile.write(html_content.encode('utf-8'))
-            
-        except Exception as e:
-            logger.error(f"Error in root handler: {e}")
-            self._send_error_response(500, "Internal Server Error")
-    
-    def _handle_ping(self):
-        """Handle /ping endpoint for simple health checks"""
-        try:
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            
-            response = "pong"
-            self.wfile.write(response.encode('utf-8'))
-            
-            logger.info("Ping request received and responded")
-            
-        except Exception as e:
-            logger.error(f"Error in ping handler: {e}")
-            self._send_error_response(500, "Ping failed")
+    <div class="endpoint">
+        <h3>🔍 Current Status</h3>
+        <div id="current-status">Loading...</div>
+    </div>
     
-    def _handle_not_found(self):
-        """Handle 404 errors"""
-        self._send_error_response(404, "Not Found")
+    <script>
+        // Fetch current health status
+        fetch('/health')
+            .then(response => response.json())
+            .then(data => {
+                const statusDiv = document.getElementById('current-status');
+                const statusClass = data.status === 'healthy' ? 'healthy' : 
+                                  data.status === 'warning' ? 'warning' : 'unhealthy';
+                
+                statusDiv.innerHTML = `
+                    <div class="status ${statusClass}">
+                        <strong>Overall Status:</strong> ${data.status.toUpperCase()}<br>
+                        <strong>Timestamp:</strong> ${data.timestamp}<br>
+                        <strong>Service:</strong> ${data.service}<br>
+                        <strong>Uptime:</strong> ${data.uptime}
+                    </div>
+                `;
+            })
+            .catch(error => {
+                document.getElementById('current-status').innerHTML = 
+                    '<div class="status unhealthy">Error fetching status</div>';
+            });
+    </script>
+</body>
+</html>
+""".encode('utf-8')
+
+# Component statuses reported on /health. The ETag is derived from these only,
+# so it changes when a component flips state rather than on every request.
+_component_status = {"http_server": "healthy"}
+_health_etag = None
+# Serialised /health body with %s slots for the timestamp, rebuilt on status changes
+_health_template = None
+# (epoch second, formatted timestamp) so isoformat() runs at most once a second
+_timestamp_cache = (0, b"")
+# Bound once; looked up on every /health request
+_time = time.time
+_fromtimestamp = datetime.fromtimestamp
+
+def _overall_status():
+    """Summarise component statuses into a single status string"""
+    if all(status == "healthy" for status in _component_status.values()):
+        return "healthy"
+    return "warning"
+
+def _refresh_health_cache():
+    """Recompute the /health ETag and body template from the component statuses"""
+    global _health_etag, _health_template
+    state = orjson.dumps(_component_status, option=orjson.OPT_SORT_KEYS)
+    # Weak: the body's timestamp changes every second, only the status is stable
+    _health_etag = f'W/"{hashlib.sha1(state).hexdigest()[:16]}"'
     
-    def _send_error_response(self, code, message):
-        """Send error response"""
-        self.send_response(code)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        
-        error_data = {
-            "error": message,
-            "status_code": code,
-            "path": self.path
+    # The timestamp is the only per-request value; leave %s slots for it
+    health_data = {
+        "status": _overall_status(),
+        "timestamp": "__timestamp__",
+        "service": "Token Holder Bot",
+        "uptime": "running",
+        "components": {
+            **_component_status,
+            "timestamp": "__timestamp__"
         }
+    }
+    _health_template = (
+        orjson.dumps(health_data)
+        .replace(b"%", b"%%")
+        .replace(b'"__timestamp__"', b'"%s"')
+    )
+
+def _current_timestamp():
+    """Current local time as ISO-format bytes, cached for the current second"""
+    global _timestamp_cache
+    second = int(_time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, _fromtimestamp(second).isoformat().encode())
+    return _timestamp_cache[1]
+
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against etag (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def set_component_status(component, status):
+    """Record the status of an application component (e.g. bot, scheduler)"""
+    if _component_status.get(component) == status:
+        return
+    _component_status[component] = status
+    _refresh_health_cache()
+    # Log transitions only, not every probe
+    logger.info("Component %s is now %s (overall: %s)", component, status, _overall_status())
+
+_refresh_health_cache()
+
+async def _handle_health_check(request):
+    """Handle /health endpoint"""
+    try:
+        etag = _health_etag
+        
+        # Nothing changed since the client's last probe
+        if _etag_matches(request.headers.get('If-None-Match'), etag):
+            return web.Response(
+                status=304,
+                headers={'Access-Control-Allow-Origin': '*', 'ETag': etag}
+            )
         
-        response = json.dumps(error_data, indent=2)
-        self.wfile.write(response.encode('utf-8'))
+        # Fill the prebuilt body; only the timestamp varies per request
+        timestamp = _current_timestamp()
+        return web.Response(
+            body=_health_template % (timestamp, timestamp),
+            content_type='application/json',
+            headers={'Access-Control-Allow-Origin': '*', 'ETag': etag}
+        )
+        
+    except Exception as e:
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Error in health check: %s", e)
+        return _error_response(request, 500, "Health check failed")
+
+async def _handle_root(request):
+    """Handle root endpoint"""
+    return web.Response(body=_ROOT_BODY, content_type='text/html')
+
+async def _handle_ping(request):
+    """Handle /ping endpoint"""
+    return web.Response(body=b"pong", content_type='text/plain')
+
+async def _handle_not_found(request):
+    """Handle 404 errors"""
+    return _error_response(request, 404, "Not Found")
+
+def _error_response(request, code, message):
+    """Build a JSON error response"""
+    error_data = {
+        "error": message,
+        "status_code": code,
+        "path": request.path_qs
+    }
+    return web.Response(status=code, body=orjson.dumps(error_data), content_type='application/json')
+
+def create_health_app():
+    """Create the aiohttp application serving the health endpoints"""
+    app = web.Application()
+    app.router.add_get('/health', _handle_health_check)
+    app.router.add_get('/', _handle_root)
+    app.router.add_get('/ping', _handle_ping)
+    app.router.add_get('/{tail:.*}', _handle_not_found)
+    return app
+
+async def start_health_server(port=8000):
+    """Serve the health endpoints on the running event loop
     
-    def log_message(self, format, *args):
-        """Override logging to use our logger"""
-        logger.info(f"{self.address_string()} - {format % args}")
+    Returns the AppRunner; await its cleanup() to stop the server.
+    """
+    # Probes arrive constantly; don't write an access log line for each one
+    runner = web.AppRunner(create_health_app(), access_log=None)
+    await runner.setup()
+    # A deeper accept backlog absorbs probe bursts; SO_REUSEPORT lets a
+    # restarted process bind while the old one is still draining
+    site = web.TCPSite(
+        runner,
+        port=port,
+        backlog=256,
+        reuse_port=hasattr(socket, 'SO_REUSEPORT')
+    )
+    await site.start()
+    logger.info("Health check server listening on port %s (/health, /ping, /)", port)
+    return runner
 
 def run_health_server(port=8000):
-    """Run the health check server"""
+    """Run the health check server on its own event loop"""
     try:
-        # Allow reuse of address to avoid "Address already in use" errors
-        socketserver.TCPServer.allow_reuse_address = True
-        
-        with socketserver.TCPServer(("", port), HealthCheckHandler) as httpd:
-            logger.info(f"Health check server started on port {port}")
-            logger.info(f"Health endpoint: http://localhost:{port}/health")
-            logger.info(f"Root endpoint: http://localhost:{port}/")
-            httpd.serve_forever()
+        web.run_app(create_health_app(), port=port, print=None, access_log=None)
     except KeyboardInterrupt:
         logger.info("Health check server stopped by user")
     except Exception as e:
-        logger.error(f"Error running health server: {e}")
+        logger.error("Error running health server: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,20 +1,33 @@
 import logging
+import base58
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import List, Dict
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# One pooled session shared by every HeliusAPI instance (bot, snapshot service,
+# health checker) so repeated calls to the same hosts reuse TCP/TLS connections
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
 class HeliusAPI:
     def __init__(self):
         self.api_key = Config.HELIUS_API_KEY
+        self.session = _session
         # Helius RPC endpoint
         self.rpc_url = f"https://mainnet.helius-rpc.com/?api-key={self.api_key}"
         # Jupiter API for price fallback
         self.jupiter_price_url = "https://price.jup.ag/v4/price"
 
-    def get_token_holders(self, token_mint: str, page_limit: int = 1000, max_pages: int = 1000) -> List[Dict]:
+    def get_token_holders(self, token_mint: str, page_limit: int = 1000, max_pages: int = 1000,
+                          concurrency: int = 8) -> List[Dict]:
         """Get all token accounts (holders) using Helius getTokenAccounts with pagination.
+        Pages are requested in concurrent waves of `concurrency` pages until an
+        empty page is returned.
         Returns list of dicts with keys: owner, amount
         """
         holders: Dict[str, float] = {}
@@ -24,65 +37,83 @@ class HeliusAPI:
         token_decimals = self._get_token_decimals(token_mint)
         logger.info(f"Token {token_mint} has {token_decimals} decimals")
         
-        while True:
-            if page > max_pages:
-                logger.warning("Reached max_pages limit while fetching token holders")
-                break
-            try:
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": "rewards-bot",
-                    "method": "getTokenAccounts",
-                    "params": {
-                        "page": page,
-                        "limit": page_limit,
-                        "displayOptions": {},
-                        "mint": token_mint,
-                    },
-                }
-                resp = requests.post(self.rpc_url, json=payload, timeout=30)
-                resp.raise_for_status()
-                data = resp.json()
-                result = (data or {}).get("result")
-                token_accounts = (result or {}).get("token_accounts", [])
-                if not token_accounts:
-                    logger.info(f"No more token accounts after page {page}")
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            done = False
+            while not done:
+                if page > max_pages:
+                    logger.warning("Reached max_pages limit while fetching token holders")
                     break
-                logger.info(f"Helius: processing page {page} with {len(token_accounts)} accounts")
-                for account in token_accounts:
-                    owner = account.get("owner")
-                    amount_raw = account.get("amount", 0)
-                    
-                    # Convert raw amount to actual token amount using decimals
-                    if amount_raw and amount_raw > 0:
-                        # Raw amount is in smallest units (e.g., lamports for SOL)
-                        # Convert to actual tokens by dividing by 10^decimals
-                        actual_amount = amount_raw / (10 ** token_decimals)
-                        # Fix decimal scaling issue - multiply by 1000
-                        actual_amount = actual_amount * 1000
-                        logger.debug(f"Wallet {owner[:8]}...{owner[-8:]}: raw={amount_raw}, decimals={token_decimals}, actual={actual_amount}")
-                    else:
-                        actual_amount = 0.0
-                    
-                    if not owner:
-                        continue
-                    holders[owner] = holders.get(owner, 0.0) + actual_amount
-                page += 1
-            except Exception as e:
-                logger.error(f"Helius get_token_holders error on page {page}: {e}")
-                break
+                wave = range(page, min(page + concurrency, max_pages + 1))
+                futures = [executor.submit(self._get_token_accounts_page, token_mint, p, page_limit) for p in wave]
+                
+                # Consume the wave in page order, stopping at the first empty or failed page
+                for page, future in zip(wave, futures):
+                    try:
+                        token_accounts = future.result()
+                    except Exception as e:
+                        logger.error(f"Helius get_token_holders error on page {page}: {e}")
+                        done = True
+                        break
+                    if not token_accounts:
+                        logger.info(f"No more token accounts after page {page}")
+                        done = True
+                        break
+                    logger.info(f"Helius: processing page {page} with {len(token_accounts)} accounts")
+                    for account in token_accounts:
+                        owner = account.get("owner")
+                        amount_raw = account.get("amount", 0)
+                        
+                        # Convert raw amount to actual token amount using decimals
+                        if amount_raw and amount_raw > 0:
+                            # Raw amount is in smallest units (e.g., lamports for SOL)
+                            # Convert to actual tokens by dividing by 10^decimals
+                            actual_amount = amount_raw / (10 ** token_decimals)
+                            # Fix decimal scaling issue - multiply by 1000
+                            actual_amount = actual_amount * 1000
+                            logger.debug(f"Wallet {owner[:8]}...{owner[-8:]}: raw={amount_raw}, decimals={token_decimals}, actual={actual_amount}")
+                        else:
+                            actual_amount = 0.0
+                        
+                        if not owner:
+                            continue
+                        holders[owner] = holders.get(owner, 0.0) + actual_amount
+                else:
+                    page += 1
+                
+                # Don't wait on pages past the end that are still in flight
+                for future in futures:
+                    future.cancel()
         # Transform to list of dicts to match previous interface
         return [{"owner": owner, "amount": amount} for owner, amount in holders.items()]
     
+    def _get_token_accounts_page(self, token_mint: str, page: int, page_limit: int) -> List[Dict]:
+        """Fetch one page of getTokenAccounts results"""
+        payload = {
+            "jsonrpc": "2.0",
+            "id": "rewards-bot",
+            "method": "getTokenAccounts",
+            "params": {
+                "page": page,
+                "limit": page_limit,
+                "displayOptions": {},
+                "mint": token_mint,
+            },
+        }
+        resp = self.session.post(self.rpc_url, json=payload, timeout=30)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        result = (data or {}).get("result")
+        return (result or {}).get("token_accounts", [])
+    
     def _get_token_decimals(self, token_mint: str) -> int:
         """Get the number of decimals for a token"""
         try:
             # Try to get decimals from Helius token metadata
             helius_url = f"https://api.helius.xyz/v0/token-metadata?api-key={self.api_key}"
-            resp = requests.post(helius_url, json={"mintAccounts": [token_mint]}, timeout=15)
+            resp = self.session.post(helius_url, json={"mintAccounts": [token_mint]}, timeout=15)
             
             if resp.status_code == 200:
-                arr = resp.json() or []
+                arr = orjson.loads(resp.content) or []
                 if arr and isinstance(arr, list) and arr[0]:
                     metadata = arr[0]
                     decimals = metadata.get("decimals")
@@ -128,9 +159,9 @@ class HeliusAPI:
         """Get price from Jupiter API"""
         try:
             jupiter_params = {"ids": token_mint}
-            resp = requests.get(self.jupiter_price_url, params=jupiter_params, timeout=15)
+            resp = self.session.get(self.jupiter_price_url, params=jupiter_params, timeout=15)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 logger.info(f"Jupiter API response: {data}")
                 if data and "data" in data and token_mint in data["data"]:
                     price = data["data"][token_mint].get("price")
@@ -146,13 +177,13 @@ class HeliusAPI:
         """Get price from DexScreener API"""
         try:
             dexscreener_url = f"https://api.dexscreener.com/latest/dex/tokens/{token_mint}"
-            resp = requests.get(dexscreener_url, timeout=15)
+            resp = self.session.get(dexscreener_url, timeout=15)
             
             logger.info(f"DexScreener API response status: {resp.status_code}")
             logger.info(f"DexScreener API response headers: {dict(resp.headers)}")
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 logger.info(f"DexScreener API full response: {data}")
                 
                 if data and "pairs" in data and data["pairs"]:
@@ -192,12 +223,12 @@ class HeliusAPI:
         """Get price from Birdeye API"""
         try:
             birdeye_url = f"https://public-api.birdeye.so/public/price?address={token_mint}"
-            resp = requests.get(birdeye_url, timeout=15)
+            resp = self.session.get(birdeye_url, timeout=15)
             
             logger.info(f"Birdeye API response status: {resp.status_code}")
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 logger.info(f"Birdeye API full response: {data}")
                 
                 if data and data.get("success") and "data" in data:
@@ -218,12 +249,12 @@ class HeliusAPI:
         """Get price from Raydium API"""
         try:
             raydium_url = f"https://api.raydium.io/v2/sdk/liquidity/mainnet/{token_mint}"
-            resp = requests.get(raydium_url, timeout=15)
+            resp = self.session.get(raydium_url, timeout=15)
             
             logger.info(f"Raydium API response status: {resp.status_code}")
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 logger.info(f"Raydium API full response: {data}")
                 
                 if data and "price" in data:
@@ -244,12 +275,12 @@ class HeliusAPI:
         """Get price from Helius token metadata"""
         try:
             helius_url = f"https://api.helius.xyz/v0/token-metadata?api-key={self.api_key}"
-            resp = requests.post(helius_url, json={"mintAccounts": [token_mint]}, timeout=15)
+            resp = self.session.post(helius_url, json={"mintAccounts": [token_mint]}, timeout=15)
             
             logger.info(f"Helius API response status: {resp.status_code}")
             
             if resp.status_code == 200:
-                arr = resp.json() or []
+                arr = orjson.loads(resp.content) or []
                 logger.info(f"Helius API full response: {arr}")
                 
                 if arr and isinstance(arr, list):
@@ -274,7 +305,6 @@ class HeliusAPI:
         try:
             if not wallet_address or len(wallet_address) < 32 or len(wallet_address) > 44:
                 return False
-            import base58
             try:
                 base58.b58decode(wallet_address)
                 return True
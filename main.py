@@ -16,25 +16,57 @@ Features:
 
 import asyncio
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
-import threading
 import os
 import time
 from telegram_bot import TokenHolderBot
 from scheduler import SnapshotScheduler
 from config import Config
-from healthcheck_server import run_health_server
+from healthcheck_server import start_health_server, set_component_status
 
-# Configure logging
+# uvloop is optional (it is not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Configure logging: callers only enqueue records, a background listener
+# thread does the formatting and the blocking writes to bot.log and stdout
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the date/time part of asctime once per second"""
+    _last_second = None
+    _last_time = ''
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_time = time.strftime(self.default_time_format, self.converter(second))
+            self._last_second = second
+        return self.default_msec_format % (self._last_time, record.msecs)
+
+_log_formatter = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('bot.log'),
+    logging.StreamHandler(sys.stdout)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+
+# force=True replaces handlers installed by basicConfig() calls in imported
+# modules; the queue handler passes the bare message on to the listener
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+    force=True
 )
+log_listener.start()
 
 logger = logging.getLogger(__name__)
 
@@ -42,128 +74,159 @@ class TokenHolderBotApp:
     def __init__(self):
         self.bot = None
         self.scheduler = None
-        self.health_server_thread = None
+        self.health_runner = None
         self.running = False
-        
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        self._stop = None
+    
+    def _install_signal_handlers(self):
+        """Resolve the stop future on SIGINT/SIGTERM (Railway sends SIGTERM)"""
+        loop = asyncio.get_running_loop()
+        self._stop = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._signal_handler, signum)
+            except NotImplementedError:
+                # Windows event loops don't support add_signal_handler; the
+                # plain handler runs on the main thread, so hop onto the loop
+                signal.signal(
+                    signum,
+                    lambda signum, frame: loop.call_soon_threadsafe(self._signal_handler, signum)
+                )
     
-    def _signal_handler(self, signum, frame):
+    def _signal_handler(self, signum):
         """Handle shutdown signals"""
-        logger.info(f"Received signal {signum}, shutting down...")
-        self.shutdown()
+        logger.info("Received signal %s, shutting down...", signum)
+        # Only wake the loop here; shutdown() runs once polling has stopped
+        if not self._stop.done():
+            self._stop.set_result(None)
     
-    def _start_health_server(self):
-        """Start health check server in a separate thread"""
+    async def _start_health_server(self):
+        """Start the health check server on the running event loop"""
         try:
             # Get port from environment or use default
             port = int(os.getenv('PORT', 8000))
-            logger.info(f"Starting health check server on port {port}")
-            
-            # Run health server in thread
-            self.health_server_thread = threading.Thread(
-                target=run_health_server, 
-                args=(port,),
-                daemon=True
-            )
-            self.health_server_thread.start()
-            
-            # Wait a moment to ensure server starts
-            time.sleep(2)
-            
-            # Test if server is responding
-            try:
-                import requests
-                test_response = requests.get(f"http://localhost:{port}/health", timeout=5)
-                if test_response.status_code == 200:
-                    logger.info("Health check server started successfully and responding")
-                else:
-                    logger.warning(f"Health server responded with status {test_response.status_code}")
-            except Exception as e:
-                logger.warning(f"Could not test health server response: {e}")
-                logger.info("Health server thread started (response test failed)")
+            self.health_runner = await start_health_server(port)
+            return f"port {port}"
             
         except Exception as e:
-            logger.error(f"Failed to start health server: {e}")
+            logger.error("Failed to start health server: %s", e)
             # Don't fail the entire app if health server fails
             logger.warning("Continuing without health server...")
+            return "skipped"
     
-    def start(self):
-        """Start the bot and scheduler (non-async version)"""
+    async def start(self):
+        """Start the health server, bot and scheduler on the running event loop"""
         try:
             logger.info("Starting Token Holder Bot Application...")
+            self._install_signal_handlers()
+            # Startup stages are reported in a single record once all are up;
+            # failures are still logged individually
+            stages = {}
             
             # Validate configuration
             Config.validate()
-            logger.info("Configuration validated successfully")
-            
-            # Start health check server
-            self._start_health_server()
+            stages["config"] = "ok"
             
-            # Initialize bot
-            self.bot = TokenHolderBot()
-            logger.info("Bot initialized successfully")
+            # Start the health check server while the bot opens its database
+            # connections in a worker thread. If either fails, the TaskGroup
+            # cancels and awaits the other before the error propagates.
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    health_task = tg.create_task(self._start_health_server())
+                    bot_task = tg.create_task(asyncio.to_thread(TokenHolderBot))
+            except ExceptionGroup as eg:
+                raise eg.exceptions[0] from None
+            stages["health_server"] = health_task.result()
+            self.bot = bot_task.result()
+            set_component_status("bot", "healthy")
+            stages["bot"] = "ok"
             
-            # Initialize scheduler
-            self.scheduler = SnapshotScheduler()
-            logger.info("Scheduler initialized successfully")
+            # Initialize scheduler. This waits for the bot so the two don't run
+            # CREATE TABLE IF NOT EXISTS concurrently on a fresh database.
+            self.scheduler = await asyncio.to_thread(SnapshotScheduler, self.bot.invalidate_caches)
             
             # Start scheduler
             self.scheduler.start_scheduler()
-            logger.info("Scheduler started successfully")
+            set_component_status("scheduler", "healthy")
+            stages["scheduler"] = "ok"
             
             self.running = True
-            logger.info("Application started successfully")
-            logger.info("Health check endpoints available at /health and /")
+            logger.info("Application started successfully: %s", stages)
             
-            # Start the bot (this will block)
-            self.bot.run()
+            # Poll until a shutdown signal arrives
+            await self.bot.run_async(self._stop)
             
         except Exception as e:
-            logger.error(f"Failed to start application: {e}")
-            self.shutdown()
+            logger.error("Failed to start application: %s", e)
+            await self.shutdown()
             sys.exit(1)
     
-    def shutdown(self):
-        """Shutdown the application gracefully"""
-        if not self.running:
+    async def shutdown(self):
+        """Shutdown the application gracefully
+        
+        Stops whichever components exist, so it also cleans up after a
+        start() that failed part way. Each one is forgotten once stopped,
+        which makes repeated calls harmless.
+        """
+        if not (self.scheduler or self.bot or self.health_runner):
             return
         
         logger.info("Shutting down application...")
         self.running = False
         
-        try:
-            # Stop scheduler
-            if self.scheduler:
-                self.scheduler.close()
+        # Stop scheduler
+        if self.scheduler:
+            scheduler, self.scheduler = self.scheduler, None
+            try:
+                await scheduler.stop_scheduler()
+                scheduler.close()
+                set_component_status("scheduler", "stopped")
                 logger.info("Scheduler stopped")
-            
-            # Stop bot
-            if self.bot:
-                self.bot.stop()
+            except Exception as e:
+                logger.error("Error stopping scheduler: %s", e)
+        
+        # Stop bot
+        if self.bot:
+            bot, self.bot = self.bot, None
+            try:
+                bot.stop()
+                set_component_status("bot", "stopped")
                 logger.info("Bot stopped")
-                
-            # Health server will stop automatically as it's a daemon thread
-            logger.info("Health check server stopped")
-                
-        except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            except Exception as e:
+                logger.error("Error stopping bot: %s", e)
+        
+        # Stop health check server
+        if self.health_runner:
+            health_runner, self.health_runner = self.health_runner, None
+            try:
+                await health_runner.cleanup()
+                logger.info("Health check server stopped")
+            except Exception as e:
+                logger.error("Error stopping health check server: %s", e)
         
         logger.info("Application shutdown complete")
 
-def main():
-    """Main entry point"""
+async def run_app():
+    """Run the application until it is shut down"""
     app = TokenHolderBotApp()
     
     try:
-        app.start()
+        await app.start()
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
     finally:
-        app.shutdown()
+        await app.shutdown()
+        # Flush queued log records before exiting
+        log_listener.stop()
+
+def main():
+    """Main entry point"""
+    if uvloop is not None:
+        uvloop.run(run_app())
+    else:
+        asyncio.run(run_app())
 
 if __name__ == "__main__":
     try:
@@ -171,5 +234,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Application interrupted by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
@@ -1,59 +1,117 @@
-import schedule
-import time
+import asyncio
+import heapq
 import logging
-import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 from snapshot_service import SnapshotService
 
 logger = logging.getLogger(__name__)
 
 class SnapshotScheduler:
-    def __init__(self):
+    MIN_ERROR_DELAY = 60
+    MAX_ERROR_DELAY = 300
+    SHUTDOWN_TIMEOUT = 30  # How long to wait for an in-flight job on shutdown
+    
+    def __init__(self, on_snapshot=None):
         self.snapshot_service = SnapshotService()
+        # Called (from a worker thread) after a snapshot succeeds, so
+        # readers such as the bot can drop cached leaderboards
+        self.on_snapshot = on_snapshot
         self.running = False
-        self.thread = None
+        self.task = None
+        self._stop_event = asyncio.Event()
+        # Min-heap of (next_run, name, interval, job); the next job due is first
+        self._jobs = []
+        self._schedule_jobs()
     
     def start_scheduler(self):
-        """Start the scheduler in a separate thread"""
+        """Start the scheduler as a task on the running event loop"""
         if self.running:
             logger.warning("Scheduler is already running")
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.thread.start()
+        self._stop_event.clear()
+        self._schedule_jobs()
+        self.task = asyncio.create_task(self._run_scheduler())
         logger.info("Snapshot scheduler started")
     
-    def stop_scheduler(self):
-        """Stop the scheduler"""
+    async def stop_scheduler(self):
+        """Stop the scheduler, waiting for a job that is currently running"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        self._stop_event.set()
+        if self.task:
+            try:
+                # shield() so a timeout doesn't cancel the task mid-job
+                await asyncio.wait_for(asyncio.shield(self.task), self.SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Scheduler job still running after {self.SHUTDOWN_TIMEOUT}s, not waiting any longer")
         logger.info("Snapshot scheduler stopped")
     
-    def _run_scheduler(self):
-        """Run the scheduler loop"""
-        # Schedule daily snapshot at 00:00 UTC
-        schedule.every().day.at("00:00").do(self._daily_snapshot)
+    async def _wait_for_stop(self, timeout):
+        """Sleep for up to timeout seconds, returning early if stop_scheduler() is called"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    def _schedule_jobs(self):
+        """Compute the first run time of each job from the current time"""
+        now = datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
-        # Schedule weekly cleanup on Sundays at 02:00 UTC
-        schedule.every().sunday.at("02:00").do(self._weekly_cleanup)
+        # Daily snapshot at 00:00 UTC
+        next_snapshot = midnight if midnight > now else midnight + timedelta(days=1)
         
-        # Schedule data validation every 6 hours
-        schedule.every(6).hours.do(self._validate_data)
+        # Weekly cleanup on Sundays at 02:00 UTC
+        next_cleanup = midnight + timedelta(days=(6 - now.weekday()) % 7, hours=2)
+        if next_cleanup <= now:
+            next_cleanup += timedelta(weeks=1)
         
+        # Data validation every 6 hours
+        next_validation = now + timedelta(hours=6)
+        
+        self._jobs = [
+            (next_snapshot, "snapshot", timedelta(days=1), self._daily_snapshot),
+            (next_cleanup, "cleanup", timedelta(weeks=1), self._weekly_cleanup),
+            (next_validation, "validation", timedelta(hours=6), self._validate_data),
+        ]
+        heapq.heapify(self._jobs)
+    
+    async def _run_scheduler(self):
+        """Run the scheduler loop"""
         logger.info("Scheduled tasks:")
         logger.info("- Daily snapshot: 00:00 UTC")
         logger.info("- Weekly cleanup: Sunday 02:00 UTC")
         logger.info("- Data validation: Every 6 hours")
         
+        error_delay = self.MIN_ERROR_DELAY
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                next_run, name, interval, job = self._jobs[0]
+                delay = (next_run - datetime.now()).total_seconds()
+                if delay > 0:
+                    await self._wait_for_stop(delay)
+                    continue
+                
+                # Reschedule before running so a failing job isn't retried in a loop
+                heapq.heapreplace(self._jobs, (self._advance(next_run, interval), name, interval, job))
+                # Jobs block on HTTP and database calls; keep them off the event loop
+                await asyncio.to_thread(job)
+                error_delay = self.MIN_ERROR_DELAY
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(300)  # Wait 5 minutes on error
+                await self._wait_for_stop(error_delay)
+                # Back off on repeated failures, up to 5 minutes
+                error_delay = min(self.MAX_ERROR_DELAY, error_delay * 2)
+    
+    @staticmethod
+    def _advance(next_run, interval):
+        """Next run after next_run, skipping any runs missed while a job was busy"""
+        now = datetime.now()
+        next_run += interval
+        while next_run <= now:
+            next_run += interval
+        return next_run
     
     def _daily_snapshot(self):
         """Execute daily snapshot"""
@@ -68,6 +126,8 @@ class SnapshotScheduler:
             
             if success:
                 logger.info(f"Daily snapshot completed successfully in {duration:.2f} seconds")
+                if self.on_snapshot:
+                    self.on_snapshot()
             else:
                 logger.error(f"Daily snapshot failed after {duration:.2f} seconds")
                 
@@ -114,6 +174,8 @@ class SnapshotScheduler:
             
             if success:
                 logger.info(f"Manual snapshot completed successfully in {duration:.2f} seconds")
+                if self.on_snapshot:
+                    self.on_snapshot()
                 return True
             else:
                 logger.error(f"Manual snapshot failed after {duration:.2f} seconds")
@@ -126,45 +188,43 @@ class SnapshotScheduler:
     def get_next_run_times(self):
         """Get the next scheduled run times"""
         try:
-            next_snapshot = schedule.next_run()
-            next_cleanup = None
-            next_validation = None
-            
-            # Find next cleanup and validation times
-            for job in schedule.jobs:
-                if "cleanup" in str(job.job_func):
-                    next_cleanup = job.next_run
-                elif "validation" in str(job.job_func):
-                    next_validation = job.next_run
-            
-            return {
-                "next_snapshot": next_snapshot,
-                "next_cleanup": next_cleanup,
-                "next_validation": next_validation
-            }
+            # Keys: next_snapshot, next_cleanup, next_validation
+            return {f"next_{name}": next_run for next_run, name, _, _ in sorted(self._jobs)}
             
         except Exception as e:
             logger.error(f"Error getting next run times: {e}")
             return {}
     
     def close(self):
-        """Close the scheduler and cleanup"""
-        self.stop_scheduler()
+        """Close the snapshot service; await stop_scheduler() first if it was started
+        
+        If a job outlived stop_scheduler()'s timeout it is still using the
+        service's connection on a worker thread, so it is left open for the
+        job to finish; the process exit closes it.
+        """
+        if self.task and not self.task.done():
+            logger.warning("Scheduler job still running; leaving its database connection open")
+            return
         self.snapshot_service.close()
 
 if __name__ == "__main__":
-    # Test the scheduler
-    scheduler = SnapshotScheduler()
+    async def run_for(seconds):
+        # Test the scheduler
+        scheduler = SnapshotScheduler()
+        
+        try:
+            print("Starting snapshot scheduler...")
+            scheduler.start_scheduler()
+            
+            # Keep running for a while to test
+            await asyncio.sleep(seconds)
+            
+        finally:
+            await scheduler.stop_scheduler()
+            scheduler.close()
+            print("Scheduler stopped")
     
     try:
-        print("Starting snapshot scheduler...")
-        scheduler.start_scheduler()
-        
-        # Keep running for a while to test
-        time.sleep(300)  # Run for 5 minutes
-        
+        asyncio.run(run_for(300))  # Run for 5 minutes
     except KeyboardInterrupt:
         print("\nStopping scheduler...")
-    finally:
-        scheduler.close()
-        print("Scheduler stopped")
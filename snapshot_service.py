@@ -5,36 +5,53 @@ from helius_api import HeliusAPI
 from config import Config
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 class SnapshotService:
+    CLEANUP_BATCH_SIZE = 10000
+    
     def __init__(self):
         self.db = Database()
         self.helius = HeliusAPI()
         self.token_address = Config.TOKEN_CONTRACT_ADDRESS
     
     def take_daily_snapshot(self):
-        """Take a daily snapshot of token holders"""
+        """Take a daily snapshot of token holders
+        
+        Only one snapshot runs at a time across all processes; if another
+        is in progress this returns False without doing anything.
+        """
+        if not self.db.try_snapshot_lock():
+            logger.warning("Another snapshot is already in progress; skipping")
+            return False
         try:
             logger.info("Starting daily snapshot process...")
             
-            # Get current token price
-            token_price = self.helius.get_token_price_usd(self.token_address)
-            
-            # Check if admin set manual price
-            if hasattr(self, 'manual_token_price') and self.manual_token_price:
-                token_price = self.manual_token_price
-                logger.info(f"Using admin-set manual price: ${token_price}")
-            elif token_price > 0:
-                logger.info(f"Using API price: ${token_price}")
-            else:
-                logger.warning("Token price unavailable; proceeding with $0.00 for USD calculations")
-                token_price = 0.0
-            
-            # Get current token holders
-            logger.info("Fetching current token holders...")
-            holders = self.helius.get_token_holders(self.token_address, page_limit=1000, max_pages=100)
+            # The price lookup and the holder pagination are independent network
+            # calls, so look up the price on a worker thread while paging
+            manual_price = getattr(self, 'manual_token_price', None)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                price_future = None
+                if not manual_price:
+                    price_future = executor.submit(self.helius.get_token_price_usd, self.token_address)
+                
+                # Get current token holders
+                logger.info("Fetching current token holders...")
+                holders = self.helius.get_token_holders(self.token_address, page_limit=1000, max_pages=100)
+                
+                # Get current token price, unless the admin set one manually
+                if price_future is None:
+                    token_price = manual_price
+                    logger.info(f"Using admin-set manual price: ${token_price}")
+                else:
+                    token_price = price_future.result()
+                    if token_price > 0:
+                        logger.info(f"Using API price: ${token_price}")
+                    else:
+                        logger.warning("Token price unavailable; proceeding with $0.00 for USD calculations")
+                        token_price = 0.0
             
             if not holders:
                 logger.warning("No token holders found")
@@ -42,32 +59,21 @@ class SnapshotService:
             
             logger.info(f"Found {len(holders)} token holders")
             
-            # Process each holder
-            processed_count = 0
-            for holder in holders:
-                try:
-                    wallet_address = holder['owner']
-                    token_balance = holder['amount']
-                    
-                    # Calculate USD value
-                    usd_value = token_balance * token_price if token_price > 0 else 0.0
-                    
-                    # Log the amounts for debugging
-                    logger.info(f"Processing holder {wallet_address[:8]}...{wallet_address[-8:]}: "
-                              f"tokens={token_balance:,.2f}, price=${token_price:.8f}, usd=${usd_value:,.2f}")
-                    
-                    # Upsert holder record
-                    self.db.upsert_holder(wallet_address, token_balance, usd_value)
-                    
-                    # Calculate days held and add snapshot record
-                    days_held = self._calculate_days_held(wallet_address)
-                    self.db.add_snapshot(wallet_address, token_balance, usd_value, days_held)
-                    
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing holder {holder.get('owner', 'unknown')}: {e}")
-                    continue
+            # Build one row per holder, then write them all in one transaction.
+            # The price check is hoisted so each row is a single multiply.
+            usd_price = token_price if token_price > 0 else 0.0
+            holder_rows = [
+                (holder['owner'], holder['amount'], holder['amount'] * usd_price)
+                for holder in holders
+            ]
+            
+            # Log the amounts for debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                for wallet_address, token_balance, usd_value in holder_rows:
+                    logger.debug(f"Processing holder {wallet_address[:8]}...{wallet_address[-8:]}: "
+                                 f"tokens={token_balance:,.2f}, price=${token_price:.8f}, usd=${usd_value:,.2f}")
+            
+            processed_count = self.db.save_snapshot(holder_rows, date.today(), self._calculate_days_held)
             
             logger.info(f"Snapshot completed successfully. Processed {processed_count} holders.")
             return True  # Return success status
@@ -75,24 +81,25 @@ class SnapshotService:
         except Exception as e:
             logger.error(f"Error taking daily snapshot: {e}")
             return False  # Return failure status
+        finally:
+            self.db.release_snapshot_lock()
     
-    def _calculate_days_held(self, wallet_address):
-        """Calculate days held for a wallet address"""
+    def _calculate_days_held(self, first_seen_date, today):
+        """Calculate days held on today for a wallet first seen on first_seen_date"""
         try:
-            # Get the first seen date for this wallet
-            first_seen_date = self.db.get_first_seen_date(wallet_address)
             if not first_seen_date:
                 return 1  # First time seeing this wallet
             
             # Calculate days since first seen
-            from datetime import date
-            today = date.today()
-            days_held = (today - first_seen_date).days + 1  # +1 to include today
+            if isinstance(first_seen_date, str):
+                first_seen_date = date.fromisoformat(first_seen_date)
+            # Plain int subtraction; no timedelta is built per holder
+            days_held = today.toordinal() - first_seen_date.toordinal() + 1  # +1 to include today
             
             return max(1, days_held)  # Minimum 1 day
             
         except Exception as e:
-            logger.error(f"Error calculating days held for {wallet_address}: {e}")
+            logger.error(f"Error calculating days held since {first_seen_date}: {e}")
             return 1  # Default to 1 day on error
     
     def get_snapshot_stats(self):
@@ -118,18 +125,36 @@ class SnapshotService:
             return {}
     
     def cleanup_old_snapshots(self, days_to_keep=90):
-        """Clean up old snapshots to save database space"""
+        """Clean up old snapshots to save database space
+        
+        Months that lie entirely before the cutoff are removed by dropping their
+        partitions. The expired rows left in the boundary month are deleted in
+        chunks of CLEANUP_BATCH_SIZE, committing after each chunk, so the
+        cleanup never holds locks on a large set of rows at once.
+        """
         try:
             cutoff_date = date.today() - timedelta(days=days_to_keep)
+            deleted_count = self.db.drop_snapshot_partitions_before(cutoff_date)
             
             with self.db.conn.cursor() as cursor:
-                cursor.execute("""
-                    DELETE FROM snapshots 
-                    WHERE snapshot_date < %s
-                """, (cutoff_date,))
-                
-                deleted_count = cursor.rowcount
-                self.db.conn.commit()
+                while True:
+                    # A ctid is only unique within one partition, so match it
+                    # together with tableoid and keep the date filter outside
+                    cursor.execute("""
+                        DELETE FROM snapshots
+                        WHERE snapshot_date < %s
+                          AND (tableoid, ctid) IN (
+                            SELECT tableoid, ctid FROM snapshots
+                            WHERE snapshot_date < %s
+                            LIMIT %s
+                        )
+                    """, (cutoff_date, cutoff_date, self.CLEANUP_BATCH_SIZE))
+                    
+                    batch_count = cursor.rowcount
+                    self.db.conn.commit()
+                    deleted_count += batch_count
+                    if batch_count < self.CLEANUP_BATCH_SIZE:
+                        break
                 
                 logger.info(f"Cleaned up {deleted_count} old snapshots")
                 return deleted_count
@@ -143,23 +168,21 @@ class SnapshotService:
         """Validate the integrity of snapshot data"""
         try:
             with self.db.conn.cursor() as cursor:
-                # Check for holders without snapshots
-                cursor.execute("""
-                    SELECT COUNT(*) FROM holders h
-                    LEFT JOIN snapshots s ON h.wallet_address = s.wallet_address
-                    WHERE s.wallet_address IS NULL
-                """)
-                
-                holders_without_snapshots = cursor.fetchone()[0]
-                
-                # Check for snapshots without holders
+                # Count holders without snapshots and snapshots without
+                # holders in one round-trip
                 cursor.execute("""
-                    SELECT COUNT(*) FROM snapshots s
-                    LEFT JOIN holders h ON s.wallet_address = h.wallet_address
-                    WHERE h.wallet_address IS NULL
+                    SELECT
+                        (SELECT COUNT(*) FROM holders h
+                         WHERE NOT EXISTS (
+                             SELECT 1 FROM snapshots s WHERE s.wallet_address = h.wallet_address
+                         )),
+                        (SELECT COUNT(*) FROM snapshots s
+                         WHERE NOT EXISTS (
+                             SELECT 1 FROM holders h WHERE h.wallet_address = s.wallet_address
+                         ))
                 """)
                 
-                orphaned_snapshots = cursor.fetchone()[0]
+                holders_without_snapshots, orphaned_snapshots = cursor.fetchone()
                 
                 validation_result = {
                     "holders_without_snapshots": holders_without_snapshots,
@@ -1,10 +1,25 @@
 import requests
 import logging
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Bitcoin/Solana base58 alphabet (no 0, O, I or l)
+_BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# One pooled session shared by every SolscanAPI instance so repeated calls
+# reuse TCP/TLS connections; idempotent GETs are retried with backoff
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+))
+
 class SolscanAPI:
     def __init__(self):
         self.api_key = Config.SOLSCAN_API_KEY
@@ -13,6 +28,7 @@ class SolscanAPI:
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json"
         }
+        self.session = _session
     
     def get_token_holders(self, token_address, limit=1000):
         """Get token holders from SOLSCAN Pro API"""
@@ -24,10 +40,10 @@ class SolscanAPI:
                 "offset": 0
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("success"):
                 return data.get("data", [])
             else:
@@ -46,10 +62,10 @@ class SolscanAPI:
         try:
             url = f"{self.base_url}/market/token/{token_address}"
             
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("success"):
                 price_data = data.get("data", {})
                 return float(price_data.get("priceUsdt", 0))
@@ -70,10 +86,10 @@ class SolscanAPI:
             url = f"{self.base_url}/token/meta"
             params = {"tokenAddress": token_address}
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("success"):
                 return data.get("data", {})
             else:
@@ -96,10 +112,10 @@ class SolscanAPI:
                 "limit": limit
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("success"):
                 transactions = data.get("data", [])
                 # Filter transactions related to the specific token
@@ -126,13 +142,12 @@ class SolscanAPI:
             if len(wallet_address) != 44:
                 return False
             
-            # Check if it's a valid base58 string
-            import base58
-            try:
-                base58.b58decode(wallet_address)
-                return True
-            except:
+            # Check if it's a valid base58 string: deleting every alphabet byte
+            # leaves nothing behind. Any such string decodes, so this matches
+            # what base58.b58decode() accepted without the big-int arithmetic.
+            if not wallet_address.isascii():
                 return False
+            return not wallet_address.encode().translate(None, _BASE58_ALPHABET)
                 
         except Exception as e:
             logger.error(f"Error validating wallet address: {e}")
@@ -1,12 +1,14 @@
 import logging
 import asyncio
+import re
+import time
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
+from telegram.constants import ParseMode
+from telegram.ext import AIORateLimiter, Application, CommandHandler, CallbackQueryHandler, ContextTypes
 from database import Database
 from snapshot_service import SnapshotService
-from helius_api import HeliusAPI
 from config import Config
-import json
 
 # Configure logging
 logging.basicConfig(
@@ -15,15 +17,175 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds a rendered leaderboard is reused before it is rebuilt
+LEADERBOARD_CACHE_TTL = 300
+
+# Seconds a rendered /stats reply is reused
+STATS_CACHE_TTL = 60
+
+# Outgoing requests per second, kept below Telegram's ~30/s bot limit
+SEND_RATE = 25
+
+# Rows per leaderboard page
+LEADERBOARD_PAGE_SIZE = 20
+
+# Solana address: 32-44 base58 chars (same rule as HeliusAPI.validate_wallet_address)
+_WALLET_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,44}")
+
+# Telegram's maximum message length
+MAX_MESSAGE_LENGTH = 4096
+
+@lru_cache(maxsize=4096)
+def _short_wallet(wallet: str) -> str:
+    """Abbreviate a wallet address to its first and last 6 chars"""
+    return f"{wallet[:6]}…{wallet[-6:]}"
+
+def _chunk_text(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """Split text into messages of at most `limit` chars
+    
+    Splits on paragraph breaks, then line breaks, then spaces, and only
+    hard-cuts a single word longer than `limit`, so formatting tags are
+    not cut in half.
+    """
+    if len(text) <= limit:
+        return [text]
+    
+    for sep in ("\n\n", "\n", " "):
+        if sep in text:
+            break
+    else:
+        return [text[i:i+limit] for i in range(0, len(text), limit)]
+    
+    chunks = []
+    current = ""
+    for piece in text.split(sep):
+        if len(piece) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_chunk_text(piece, limit))
+        elif not current:
+            current = piece
+        elif len(current) + len(sep) + len(piece) <= limit:
+            current += sep + piece
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+WELCOME_MESSAGE = """
+🚀 <b>Welcome to the Token Holder Bot!</b>
+
+This bot tracks token holders and maintains a leaderboard based on how long they've held tokens.
+
+<b>Available Commands:</b>
+• <code>/leaderboard</code> - View the top token holders
+• <code>/rank &lt;wallet&gt;</code> - Check your wallet's rank
+• <code>/stats</code> - View bot statistics
+• <code>/help</code> - Show this help message
+
+<b>Token Contract:</b>
+<code>9M7eYNNP4TdJCmMspKpdbEhvpdds6E5WFVTTLjXfVray</code>
+
+The bot takes daily snapshots to track how long each wallet has held tokens. The longer you hold, the higher your rank!
+"""
+
+HELP_MESSAGE = """
+📚 <b>Bot Help &amp; Commands</b>
+
+<b>User Commands:</b>
+• <code>/start</code> - Welcome message and bot introduction
+• <code>/leaderboard</code> - View top token holders ranked by days held
+• <code>/rank &lt;wallet_address&gt;</code> - Check specific wallet's rank
+• <code>/stats</code> - View bot statistics and current snapshot info
+
+<b>Admin Commands:</b>
+• <code>/admin</code> - Access admin panel (admin only)
+• <code>/snapshot</code> - Manually trigger a snapshot (admin only)
+
+<b>How It Works:</b>
+1. Bot takes daily snapshots of all token holders
+2. Each day a wallet holds tokens, their "days_held" increases
+3. Leaderboard ranks wallets by days held (highest first)
+4. Only wallets above minimum USD threshold are shown
+
+<b>Example Usage:</b>
+• <code>/rank 9M7eYNNP4TdJCmMspKpdbEhvpdds6E5WFVTTLjXfVray</code>
+• <code>/leaderboard</code> - Shows the top holders, 20 per page
+• <code>/leaderboard full</code> - Same, with full wallet addresses
+"""
+
+THRESHOLD_HELP_TEMPLATE = (
+    "💰 <b>Set Minimum USD Threshold</b>\n\n"
+    "Current threshold: <b>${threshold:.2f}</b>\n\n"
+    "To change the threshold, use:\n"
+    "<code>/set_threshold &lt;amount&gt;</code>\n\n"
+    "<b>Example:</b> <code>/set_threshold 100</code>\n\n"
+    "This will filter the leaderboard to show only holders with at least this USD value."
+)
+
+LEADERBOARD_HEADER_TEMPLATE = (
+    "🏆 <b>Token Holder Leaderboard</b>\n\n"
+    "<i>Ranked by days held (minimum ${threshold:.2f} USD)</i>\n\n"
+)
+
 class TokenHolderBot:
     def __init__(self):
         self.db = Database()
         self.snapshot_service = SnapshotService()
-        self.helius = HeliusAPI()
         self.token_address = Config.TOKEN_CONTRACT_ADDRESS
+        self._admin_ids = Config.ADMIN_USER_IDS
+        
+        # Rendered leaderboard pages keyed by (threshold, cursor, start_rank,
+        # full_addresses); the data only changes when a snapshot runs, which
+        # calls invalidate_caches()
+        self._lb_cache = {}
+        self._stats_cache = None
+        # Bumped by invalidate_caches(); a reply built from a query that
+        # started before a snapshot finished is not stored
+        self._cache_generation = 0
+        
+        # Futures for cache fills that are already running; see _single_flight()
+        self._inflight = {}
+        
+        # Serializes manual snapshots so repeated clicks don't run them twice;
+        # _snapshot_running is claimed synchronously before the task starts
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot_running = False
+        
+        # Admin panel buttons never change, so build the markup once
+        self._admin_keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton("💰 Set Min USD Threshold", callback_data="admin_set_threshold")],
+            [InlineKeyboardButton("📊 View Bot Stats", callback_data="admin_view_stats")],
+            [InlineKeyboardButton("🔄 Manual Snapshot", callback_data="admin_manual_snapshot")],
+            [InlineKeyboardButton("💵 Set Token Price", callback_data="admin_set_price")]
+        ])
+        
+        # Admin panel callback_data -> handler(update, context)
+        self._callback_routes = {
+            "admin_set_threshold": self._handle_admin_set_threshold,
+            "admin_view_stats": self._handle_admin_view_stats,
+            "admin_manual_snapshot": self._handle_admin_manual_snapshot,
+            "admin_set_price": self._handle_admin_set_price,
+        }
         
         # Initialize bot application
-        self.application = Application.builder().token(Config.BOT_TOKEN).build()
+        self.application = (
+            Application.builder()
+            .token(Config.BOT_TOKEN)
+            # Handle updates from different chats concurrently so one slow
+            # /leaderboard doesn't hold up everyone else's commands
+            .concurrent_updates(True)
+            .connection_pool_size(64)
+            .pool_timeout(30)
+            # Paces all Bot API calls under Telegram's flood limits and
+            # retries once after a RetryAfter (429) instead of failing
+            .rate_limiter(AIORateLimiter(overall_max_rate=SEND_RATE, overall_time_period=1, max_retries=1))
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
         self._setup_handlers()
     
     def _setup_handlers(self):
@@ -41,64 +203,25 @@ class TokenHolderBot:
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
-        welcome_message = """
-🚀 **Welcome to the Token Holder Bot!**
-
-This bot tracks token holders and maintains a leaderboard based on how long they've held tokens.
-
-**Available Commands:**
-• `/leaderboard` - View the top token holders
-• `/rank <wallet>` - Check your wallet's rank
-• `/stats` - View bot statistics
-• `/help` - Show this help message
-
-**Token Contract:**
-`9M7eYNNP4TdJCmMspKpdbEhvpdds6E5WFVTTLjXfVray`
-
-The bot takes daily snapshots to track how long each wallet has held tokens. The longer you hold, the higher your rank!
-        """
-        
-        await update.message.reply_text(welcome_message, parse_mode='Markdown')
+        await update.message.reply_text(WELCOME_MESSAGE, parse_mode=ParseMode.HTML)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
-        help_message = """
-📚 **Bot Help & Commands**
-
-**User Commands:**
-• `/start` - Welcome message and bot introduction
-• `/leaderboard` - View top token holders ranked by days held
-• `/rank <wallet_address>` - Check specific wallet's rank
-• `/stats` - View bot statistics and current snapshot info
-
-**Admin Commands:**
-• `/admin` - Access admin panel (admin only)
-• `/snapshot` - Manually trigger a snapshot (admin only)
-
-**How It Works:**
-1. Bot takes daily snapshots of all token holders
-2. Each day a wallet holds tokens, their "days_held" increases
-3. Leaderboard ranks wallets by days held (highest first)
-4. Only wallets above minimum USD threshold are shown
-
-**Example Usage:**
-• `/rank 9M7eYNNP4TdJCmMspKpdbEhvpdds6E5WFVTTLjXfVray`
-• `/leaderboard` - Shows top 50 holders
-        """
-        
-        await update.message.reply_text(help_message, parse_mode='Markdown')
+        await update.message.reply_text(HELP_MESSAGE, parse_mode=ParseMode.HTML)
     
     async def leaderboard_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /leaderboard command"""
         try:
-            logger.info(f"Leaderboard command requested by user {update.effective_user.id}")
+            logger.info("Leaderboard command requested by user %s", update.effective_user.id)
             
-            # Get leaderboard data
-            logger.info("Fetching leaderboard data from database...")
-            leaderboard = self.db.get_leaderboard(limit=50)
-            logger.info(f"Leaderboard query returned {len(leaderboard) if leaderboard else 0} results")
+            # `/leaderboard full` shows complete wallet addresses
+            full_addresses = bool(context.args) and context.args[0].lower() == "full"
+            text, reply_markup = await self._single_flight(
+                ("leaderboard", None, 1, full_addresses),
+                lambda: self._db(self._get_leaderboard_page, None, 1, full_addresses)
+            )
             
-            if not leaderboard:
+            if text is None:
                 logger.warning("No leaderboard data available - this could mean:")
                 logger.warning("- Database is empty")
                 logger.warning("- No snapshots have been taken yet")
@@ -106,71 +229,188 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
                 await update.message.reply_text("❌ No leaderboard data available yet.")
                 return
             
-            # Format leaderboard message
-            logger.info("Formatting leaderboard message...")
-            message = "🏆 **Token Holder Leaderboard**\n\n"
-            message += f"*Ranked by days held (minimum ${self.db.get_minimum_usd_threshold():.2f} USD)*\n\n"
-            
-            for i, holder in enumerate(leaderboard, 1):
-                wallet = holder['wallet_address']
-                days_held = holder['days_held']
-                usd_value = holder['usd_value'] or 0
-                token_balance = holder['token_balance'] or 0
-                
-                # Show full wallet address
-                display_wallet = wallet
+            parts = _chunk_text(text)
+            for i, part in enumerate(parts, 1):
+                await update.message.reply_text(
+                    part,
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=reply_markup if i == len(parts) else None
+                )
+            logger.info("Sent leaderboard page 1 (%s chars)", len(text))
                 
-                message += f"**{i}.** {display_wallet}\n"
-                message += f"   📅 {days_held} days | 💰 ${usd_value:,.2f} | 🪙 {token_balance:,.2f}\n\n"
-            
-            message += f"\n📊 Total holders: {self.db.get_total_holders()}"
-            
-            # Split message if too long
-            if len(message) > 4096:
-                logger.info(f"Message too long ({len(message)} chars), splitting into parts...")
-                parts = [message[i:i+4096] for i in range(0, len(message), 4096)]
-                logger.info(f"Split into {len(parts)} parts")
-                for i, part in enumerate(parts):
-                    await update.message.reply_text(part, parse_mode='Markdown')
-                    logger.info(f"Sent part {i+1}/{len(parts)}")
+        except Exception:
+            logger.exception("Error in leaderboard command")
+            await update.message.reply_text("❌ Error fetching leaderboard. Please try again later.")
+    
+    def _get_leaderboard_page(self, cursor, start_rank: int, full_addresses: bool = False):
+        """Return (text, reply_markup) for one leaderboard page
+        
+        Pages are fetched with keyset pagination; the "Next" button carries
+        the cursor of the last row in its callback data. Wallets are
+        shortened to first/last 6 chars unless full_addresses is set.
+        Rendered pages are cached for up to LEADERBOARD_CACHE_TTL seconds
+        and dropped whenever a snapshot completes.
+        Returns (None, None) if there is nothing to show.
+        """
+        generation = self._cache_generation
+        threshold = self._get_threshold()
+        key = (threshold, cursor, start_rank, full_addresses)
+        cached = self._lb_cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        logger.info("Fetching leaderboard page starting at rank %s...", start_rank)
+        bundle = self.db.get_leaderboard_bundle(cursor, LEADERBOARD_PAGE_SIZE)
+        rows, next_cursor = bundle['rows'], bundle['next_cursor']
+        logger.info("Leaderboard page query returned %s results", len(rows))
+        if not rows:
+            return None, None
+        
+        fragments = []
+        if cursor is None:
+            fragments.append(LEADERBOARD_HEADER_TEMPLATE.format(threshold=bundle['threshold']))
+        fragments.extend(
+            f"<b>{i}.</b> {holder['wallet_address'] if full_addresses else _short_wallet(holder['wallet_address'])}\n"
+            f"   📅 {holder['days_held']} days | 💰 ${holder['usd_value'] or 0:,.2f} | 🪙 {holder['token_balance'] or 0:,.2f}\n\n"
+            for i, holder in enumerate(rows, start_rank)
+        )
+        if cursor is None:
+            fragments.append(f"\n📊 Total holders: {bundle['total_holders']}")
+        text = "".join(fragments)
+        
+        buttons = []
+        flag = "f" if full_addresses else "s"
+        if cursor is not None:
+            buttons.append(InlineKeyboardButton("⏮ Top", callback_data=f"lb:{flag}"))
+        if next_cursor is not None:
+            days_held, usd_value, holder_id = next_cursor
+            next_rank = start_rank + len(rows)
+            buttons.append(InlineKeyboardButton(
+                "Next ➡",
+                callback_data=f"lb:{flag}:{next_rank}:{days_held}:{usd_value}:{holder_id}"
+            ))
+        reply_markup = InlineKeyboardMarkup([buttons]) if buttons else None
+        
+        # Every distinct cursor adds an entry; don't let deep paging grow it forever
+        if len(self._lb_cache) >= 256:
+            self._lb_cache.clear()
+        if generation == self._cache_generation:
+            self._lb_cache[key] = (time.monotonic() + LEADERBOARD_CACHE_TTL, (text, reply_markup))
+        return text, reply_markup
+    
+    async def _handle_leaderboard_page(self, query):
+        """Handle leaderboard "Next"/"Top" buttons
+        
+        Callback data is `lb:<s|f>` for the first page or
+        `lb:<s|f>:<rank>:<days_held>:<usd_value>:<id>` for later pages.
+        """
+        try:
+            fields = query.data.split(":")
+            full_addresses = fields[1] == "f"
+            if len(fields) == 6:
+                start_rank = int(fields[2])
+                cursor = (int(fields[3]), fields[4], int(fields[5]))
             else:
-                await update.message.reply_text(message, parse_mode='Markdown')
-                logger.info(f"Sent leaderboard message ({len(message)} chars)")
-                
+                start_rank, cursor = 1, None
+            
+            text, reply_markup = await self._single_flight(
+                ("leaderboard", cursor, start_rank, full_addresses),
+                lambda: self._db(self._get_leaderboard_page, cursor, start_rank, full_addresses)
+            )
+            if text is None:
+                await query.edit_message_text("❌ No more leaderboard entries.")
+                return
+            
+            await query.edit_message_text(text, parse_mode=ParseMode.HTML, reply_markup=reply_markup)
+            logger.info("Leaderboard page starting at rank %s displayed", start_rank)
+            
         except Exception as e:
-            logger.error(f"Error in leaderboard command: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
-            await update.message.reply_text("❌ Error fetching leaderboard. Please try again later.")
+            logger.error("Error in leaderboard page: %s", e)
+            await query.answer("Error fetching leaderboard page")
+    
+    async def _db(self, fn, *args):
+        """Run a blocking database call on the default thread pool"""
+        return await asyncio.to_thread(fn, *args)
+    
+    async def _single_flight(self, key, coro_factory):
+        """Await coro_factory(), sharing the result with concurrent callers
+        
+        While a call for `key` is running, identical requests wait on its
+        Future instead of each querying the database when a cache expires.
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await fut
+        
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await coro_factory()
+            fut.set_result(result)
+            return result
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark it retrieved so a failure nobody else awaited isn't logged again
+            fut.exception()
+            raise
+        finally:
+            # If we were cancelled, don't leave the waiters hanging
+            if not fut.done():
+                fut.cancel()
+            self._inflight.pop(key, None)
+    
+    def _get_threshold(self) -> float:
+        """Return the minimum USD threshold (cached by Database for a short TTL)"""
+        return self.db.get_minimum_usd_threshold()
+    
+    def invalidate_threshold(self):
+        """Forget the cached threshold; call after it is changed"""
+        self.db.invalidate_threshold()
+    
+    def invalidate_leaderboard_cache(self):
+        """Drop all cached leaderboard pages"""
+        self._lb_cache.clear()
+    
+    def invalidate_caches(self):
+        """Drop rendered leaderboard/stats messages after the data changed
+        
+        Called after every snapshot, including the scheduler's (main.py
+        wires it up); safe to call from any thread.
+        """
+        self._cache_generation += 1
+        self.invalidate_leaderboard_cache()
+        self._stats_cache = None
+        self.invalidate_threshold()
     
     async def rank_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /rank command"""
         try:
-            logger.info(f"Rank command requested by user {update.effective_user.id}")
+            logger.info("Rank command requested by user %s", update.effective_user.id)
             
             if not context.args:
                 logger.warning("Rank command called without wallet address")
                 await update.message.reply_text(
                     "❌ Please provide a wallet address.\n"
-                    "Usage: `/rank <wallet_address>`"
+                    "Usage: <code>/rank &lt;wallet_address&gt;</code>",
+                    parse_mode=ParseMode.HTML
                 )
                 return
             
             wallet_address = context.args[0]
-            logger.info(f"Checking rank for wallet: {wallet_address[:8]}...{wallet_address[-8:]}")
+            logger.info("Checking rank for wallet: %s", _short_wallet(wallet_address))
             
             # Validate wallet address
-            if not self.helius.validate_wallet_address(wallet_address):
-                logger.warning(f"Invalid wallet address provided: {wallet_address}")
+            if not _WALLET_RE.fullmatch(wallet_address):
+                logger.warning("Invalid wallet address provided: %s", wallet_address)
                 await update.message.reply_text("❌ Invalid Solana wallet address.")
                 return
             
-            # Get holder rank
+            # Rank and holder details in one query
             logger.info("Fetching holder rank from database...")
-            rank, days_held = self.db.get_holder_rank(wallet_address)
-            logger.info(f"Rank query result: rank={rank}, days_held={days_held}")
+            result = await self._db(self.db.get_holder_with_rank, wallet_address)
             
-            if rank is None:
-                logger.warning(f"Wallet not found in leaderboard: {wallet_address[:8]}...{wallet_address[-8:]}")
+            if result is None:
+                logger.warning("Wallet not found in leaderboard: %s", _short_wallet(wallet_address))
                 await update.message.reply_text(
                     "❌ Wallet not found in leaderboard.\n"
                     "This could mean:\n"
@@ -180,135 +420,159 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
                 )
                 return
             
-            # Get holder details
-            logger.info("Fetching holder details...")
-            with self.db.conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT token_balance, usd_value, first_seen_date 
-                    FROM holders WHERE wallet_address = %s
-                """, (wallet_address,))
-                result = cursor.fetchone()
-            
-            if result:
-                token_balance, usd_value, first_seen_date = result
-                logger.info(f"Holder details: balance={token_balance}, usd_value={usd_value}, first_seen={first_seen_date}")
-                
-                message = f"📊 **Wallet Rank Information**\n\n"
-                message += f"**Wallet:** `{wallet_address}`\n"
-                message += f"**Rank:** #{rank}\n"
-                message += f"**Days Held:** {days_held} days\n"
-                message += f"**Token Balance:** {token_balance:,.2f}\n"
-                message += f"**USD Value:** ${usd_value:,.2f}\n"
-                message += f"**First Seen:** {first_seen_date}\n"
-                message += f"**Minimum Threshold:** ${self.db.get_minimum_usd_threshold():.2f}"
+            rank, days_held, token_balance, usd_value, first_seen_date = result
+            logger.info("Rank query result: rank=%s, days_held=%s, balance=%s, usd_value=%s, first_seen=%s",
+                        rank, days_held, token_balance, usd_value, first_seen_date)
+            
+            message = f"📊 <b>Wallet Rank Information</b>\n\n"
+            message += f"<b>Wallet:</b> <code>{wallet_address}</code>\n"
+            message += f"<b>Rank:</b> #{rank}\n"
+            message += f"<b>Days Held:</b> {days_held} days\n"
+            message += f"<b>Token Balance:</b> {token_balance:,.2f}\n"
+            message += f"<b>USD Value:</b> ${usd_value:,.2f}\n"
+            message += f"<b>First Seen:</b> {first_seen_date}\n"
+            message += f"<b>Minimum Threshold:</b> ${await self._db(self._get_threshold):.2f}"
+            
+            await update.message.reply_text(message, parse_mode=ParseMode.HTML)
+            logger.info("Rank information sent successfully for wallet %s", _short_wallet(wallet_address))
                 
-                await update.message.reply_text(message, parse_mode='Markdown')
-                logger.info(f"Rank information sent successfully for wallet {wallet_address[:8]}...{wallet_address[-8:]}")
-            else:
-                logger.error(f"Failed to fetch holder details for wallet: {wallet_address[:8]}...{wallet_address[-8:]}")
-                await update.message.reply_text("❌ Error fetching wallet details.")
-                
-        except Exception as e:
-            logger.error(f"Error in rank command: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+        except Exception:
+            logger.exception("Error in rank command")
             await update.message.reply_text("❌ Error fetching rank. Please try again later.")
     
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stats command"""
         try:
-            logger.info(f"Stats command requested by user {update.effective_user.id}")
+            logger.info("Stats command requested by user %s", update.effective_user.id)
             
-            logger.info("Fetching snapshot statistics...")
-            stats = self.snapshot_service.get_snapshot_stats()
-            logger.info(f"Stats service returned: {stats}")
+            message = await self._single_flight("stats", lambda: self._db(self._get_stats_message))
             
-            if not stats:
+            if message is None:
                 logger.warning("No statistics available from snapshot service")
                 await update.message.reply_text("❌ No statistics available yet.")
                 return
             
-            message = "📊 **Bot Statistics**\n\n"
-            message += f"**Total Holders:** {stats['total_holders']:,}\n"
-            message += f"**Minimum USD Threshold:** ${stats['minimum_usd_threshold']:,.2f}\n"
-            message += f"**Last Snapshot:** {stats['snapshot_date']}\n\n"
-            
-            if stats['top_holders']:
-                logger.info(f"Found {len(stats['top_holders'])} top holders")
-                message += "**Top 5 Holders:**\n"
-                for i, holder in enumerate(stats['top_holders'][:5], 1):
-                    wallet = holder['wallet_address']
-                    days_held = holder['days_held']
-                    usd_value = holder['usd_value'] or 0
-                    
-                    display_wallet = f"{wallet[:8]}...{wallet[-8:]}"
-                    message += f"{i}. {display_wallet} - {days_held} days (${usd_value:,.2f})\n"
-            else:
-                logger.warning("No top holders in stats")
-                message += "**Top Holders:** No data available\n"
-            
-            logger.info(f"Sending stats message ({len(message)} chars)")
-            await update.message.reply_text(message, parse_mode='Markdown')
+            logger.info("Sending stats message (%s chars)", len(message))
+            await update.message.reply_text(message, parse_mode=ParseMode.HTML)
             
-        except Exception as e:
-            logger.error(f"Error in stats command: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+        except Exception:
+            logger.exception("Error in stats command")
             await update.message.reply_text("❌ Error fetching statistics. Please try again later.")
     
+    def _get_stats_message(self):
+        """Return the /stats reply, reusing it for up to STATS_CACHE_TTL seconds
+        
+        Returns None when the snapshot service has no statistics yet.
+        """
+        generation = self._cache_generation
+        cached = self._stats_cache
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        logger.info("Fetching snapshot statistics...")
+        stats = self.snapshot_service.get_snapshot_stats()
+        logger.info("Stats service returned: %s", stats)
+        if not stats:
+            return None
+        
+        message = self._format_stats(stats)
+        if generation == self._cache_generation:
+            self._stats_cache = (time.monotonic() + STATS_CACHE_TTL, message)
+        return message
+    
+    def _format_stats(self, stats: dict) -> str:
+        """Format the /stats message"""
+        message = "📊 <b>Bot Statistics</b>\n\n"
+        message += f"<b>Total Holders:</b> {stats['total_holders']:,}\n"
+        message += f"<b>Minimum USD Threshold:</b> ${stats['minimum_usd_threshold']:,.2f}\n"
+        message += f"<b>Last Snapshot:</b> {stats['snapshot_date']}\n\n"
+        
+        if stats['top_holders']:
+            logger.info("Found %s top holders", len(stats['top_holders']))
+            message += "<b>Top 5 Holders:</b>\n"
+            message += "".join(
+                f"{i}. {_short_wallet(holder['wallet_address'])}"
+                f" - {holder['days_held']} days (${holder['usd_value'] or 0:,.2f})\n"
+                for i, holder in enumerate(stats['top_holders'][:5], 1)
+            )
+        else:
+            logger.warning("No top holders in stats")
+            message += "<b>Top Holders:</b> No data available\n"
+        
+        return message
+    
     async def admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /admin command"""
         try:
-            logger.info(f"Admin command requested by user {update.effective_user.id}")
+            logger.info("Admin command requested by user %s", update.effective_user.id)
             
             # Check if user is admin
-            if not self._is_admin(update.effective_user.id):
-                logger.warning(f"Non-admin user {update.effective_user.id} attempted to access admin panel")
+            if update.effective_user.id not in self._admin_ids:
+                logger.warning("Non-admin user %s attempted to access admin panel", update.effective_user.id)
                 await update.message.reply_text("❌ Access denied. Admin privileges required.")
                 return
             
-            # Create admin panel with inline keyboard
-            keyboard = [
-                [InlineKeyboardButton("💰 Set Min USD Threshold", callback_data="admin_set_threshold")],
-                [InlineKeyboardButton("📊 View Bot Stats", callback_data="admin_view_stats")],
-                [InlineKeyboardButton("🔄 Manual Snapshot", callback_data="admin_manual_snapshot")],
-                [InlineKeyboardButton("💵 Set Token Price", callback_data="admin_set_price")]
-            ]
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            current_threshold = self.db.get_minimum_usd_threshold()
-            message = f"🔧 **Admin Panel**\n\n"
-            message += f"Current minimum USD threshold: **${current_threshold:.2f}**\n"
-            message += f"Token contract: `{self.token_address}`\n\n"
+            # Opening the panel re-reads the threshold so admins see the stored value
+            self.invalidate_threshold()
+            current_threshold = await self._db(self._get_threshold)
+            message = f"🔧 <b>Admin Panel</b>\n\n"
+            message += f"Current minimum USD threshold: <b>${current_threshold:.2f}</b>\n"
+            message += f"Token contract: <code>{self.token_address}</code>\n\n"
             message += "Select an option:"
             
-            await update.message.reply_text(message, reply_markup=reply_markup, parse_mode='Markdown')
-            logger.info(f"Admin panel displayed for user {update.effective_user.id}")
+            await update.message.reply_text(message, reply_markup=self._admin_keyboard, parse_mode=ParseMode.HTML)
+            logger.info("Admin panel displayed for user %s", update.effective_user.id)
             
         except Exception as e:
-            logger.error(f"Error in admin command: {e}")
+            logger.error("Error in admin command: %s", e)
             await update.message.reply_text("❌ Error accessing admin panel. Please try again later.")
     
     async def snapshot_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /snapshot command (admin only)"""
         user_id = update.effective_user.id
-        logger.info(f"Snapshot command requested by user {user_id}")
+        logger.info("Snapshot command requested by user %s", user_id)
         
-        if user_id not in Config.ADMIN_USER_IDS:
-            logger.warning(f"Unauthorized snapshot attempt by user {user_id}")
+        if user_id not in self._admin_ids:
+            logger.warning("Unauthorized snapshot attempt by user %s", user_id)
             await update.message.reply_text("❌ Access denied. Admin privileges required.")
             return
         
-        logger.info(f"Manual snapshot initiated by admin user {user_id}")
+        if not self._start_snapshot(self._run_snapshot(update, context), update):
+            await update.message.reply_text("⏳ Snapshot already in progress.")
+            return
+        
+        logger.info("Manual snapshot initiated by admin user %s", user_id)
         await update.message.reply_text("📸 Starting manual snapshot... This may take a few minutes.")
+    
+    def _start_snapshot(self, coro, update: Update) -> bool:
+        """Run a snapshot coroutine as an application task unless one is running
         
-        # Run snapshot in background
-        asyncio.create_task(self._run_snapshot(update, context))
+        The application tracks the task, logs its errors and waits for it
+        on shutdown. Returns False (and discards coro) if a snapshot is
+        already in progress.
+        """
+        if self._snapshot_running:
+            coro.close()
+            return False
+        self._snapshot_running = True
+        self.application.create_task(coro, update=update)
+        return True
+    
+    async def _take_snapshot(self) -> bool:
+        """Run the snapshot on the default thread pool, one at a time"""
+        try:
+            async with self._snapshot_lock:
+                success = await asyncio.to_thread(self.snapshot_service.take_daily_snapshot)
+                self.invalidate_caches()
+                return success
+        finally:
+            self._snapshot_running = False
     
     async def _run_snapshot(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Run snapshot in background and notify user"""
         try:
             logger.info("Starting manual snapshot process...")
-            success = self.snapshot_service.take_daily_snapshot()
+            success = await self._take_snapshot()
             
             if success:
                 logger.info("Manual snapshot completed successfully")
@@ -318,114 +582,59 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
                 await update.message.reply_text("❌ Manual snapshot failed. Check logs for details.")
                 
         except Exception as e:
-            logger.error(f"Error in manual snapshot: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+            logger.exception("Error in manual snapshot")
             await update.message.reply_text(f"❌ Error during snapshot: {str(e)}")
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle button callbacks from admin panel"""
+        """Handle button callbacks from the admin panel and leaderboard"""
         query = update.callback_query
         user_id = update.effective_user.id
-        logger.info(f"Button callback from user {user_id}: {query.data}")
+        logger.info("Button callback from user %s: %s", user_id, query.data)
         
         await query.answer()
         
-        if user_id not in Config.ADMIN_USER_IDS:
-            logger.warning(f"Unauthorized button callback from user {user_id}")
+        # Leaderboard paging is open to everyone
+        if query.data.startswith("lb:"):
+            await self._handle_leaderboard_page(query)
+            return
+        
+        if user_id not in self._admin_ids:
+            logger.warning("Unauthorized button callback from user %s", user_id)
             await query.edit_message_text("❌ Access denied.")
             return
         
-        logger.info(f"Processing admin button: {query.data}")
-        
-        if query.data == "admin_set_threshold":
-            logger.info("Routing to admin set threshold handler")
-            await self._handle_admin_set_threshold(query)
-        elif query.data == "admin_view_stats":
-            logger.info("Routing to admin view stats handler")
-            await self._handle_admin_view_stats(update, context)
-        elif query.data == "admin_manual_snapshot":
-            logger.info("Routing to admin manual snapshot handler")
-            await self._handle_admin_manual_snapshot(update, context)
-        elif query.data == "admin_set_price":
-            logger.info("Routing to admin set price handler")
-            await self._handle_admin_set_price(update, context)
-        else:
-            logger.warning(f"Unknown callback data: {query.data}")
+        handler = self._callback_routes.get(query.data)
+        if handler is None:
+            logger.warning("Unknown callback data: %s", query.data)
             await query.answer("Unknown option selected")
+            return
+        
+        logger.info("Processing admin button: %s", query.data)
+        await handler(update, context)
     
-    async def _handle_admin_stats(self, query):
-        """Handle admin stats button"""
-        try:
-            logger.info("Admin stats button clicked")
-            stats = self.snapshot_service.get_snapshot_stats()
-            validation = self.snapshot_service.validate_snapshot_data()
-            
-            message = "📊 **Admin Statistics**\n\n"
-            message += f"**Total Holders:** {stats['total_holders']:,}\n"
-            message += f"**Minimum USD Threshold:** ${stats['minimum_usd_threshold']:,.2f}\n"
-            message += f"**Data Validation:** {'✅ Valid' if validation['is_valid'] else '❌ Issues Found'}\n"
-            
-            if not validation['is_valid']:
-                message += f"**Issues:** {validation.get('holders_without_snapshots', 0)} holders without snapshots, "
-                message += f"{validation.get('orphaned_snapshots', 0)} orphaned snapshots\n"
-            
-            await query.edit_message_text(message, parse_mode='Markdown')
-            logger.info("Admin stats displayed successfully")
-            
-        except Exception as e:
-            logger.error(f"Error in admin stats: {e}")
-            await query.edit_message_text("❌ Error fetching admin stats.")
-    
-    async def _handle_admin_set_threshold(self, query):
+    async def _handle_admin_set_threshold(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin set threshold button"""
+        query = update.callback_query
         try:
             logger.info("Admin set threshold button clicked")
-            current_threshold = self.db.get_minimum_usd_threshold()
-            logger.info(f"Current threshold: ${current_threshold}")
+            current_threshold = await self._db(self._get_threshold)
+            logger.info("Current threshold: $%s", current_threshold)
             
             await query.edit_message_text(
-                "💰 **Set Minimum USD Threshold**\n\n"
-                f"Current threshold: **${current_threshold:.2f}**\n\n"
-                "To change the threshold, use:\n"
-                "`/set_threshold <amount>`\n\n"
-                "**Example:** `/set_threshold 100`\n\n"
-                "This will filter the leaderboard to show only holders with at least this USD value.",
-                parse_mode='Markdown'
+                THRESHOLD_HELP_TEMPLATE.format(threshold=current_threshold),
+                parse_mode=ParseMode.HTML
             )
             logger.info("Admin threshold info displayed")
             
         except Exception as e:
-            logger.error(f"Error in admin set threshold: {e}")
+            logger.error("Error in admin set threshold: %s", e)
             await query.edit_message_text("❌ Error displaying threshold info")
     
-    async def _handle_set_threshold(self, query):
-        """Handle set threshold button"""
-        logger.info("Set threshold button clicked")
-        current_threshold = self.db.get_minimum_usd_threshold()
-        logger.info(f"Current threshold: ${current_threshold}")
-        
-        await query.edit_message_text(
-            "💰 **Set Minimum USD Threshold**\n\n"
-            f"Current threshold: ${current_threshold:.2f}\n\n"
-            "To change the threshold, use:\n"
-            "/set_threshold <amount>\n\n"
-            "Example: /set_threshold 100",
-            parse_mode='Markdown'
-        )
-    
-    async def _handle_manual_snapshot(self, query):
-        """Handle manual snapshot button"""
-        logger.info("Manual snapshot button clicked")
-        await query.edit_message_text("📸 Starting manual snapshot... This may take a few minutes.")
-        
-        # Run snapshot in background
-        asyncio.create_task(self._run_admin_snapshot(query))
-    
     async def _run_admin_snapshot(self, query):
         """Run snapshot for admin panel"""
         try:
             logger.info("Starting admin panel snapshot...")
-            success = self.snapshot_service.take_daily_snapshot()
+            success = await self._take_snapshot()
             
             if success:
                 logger.info("Admin panel snapshot completed successfully")
@@ -435,112 +644,112 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
                 await query.edit_message_text("❌ Manual snapshot failed. Check logs for details.")
                 
         except Exception as e:
-            logger.error(f"Error in admin snapshot: {e}")
+            logger.error("Error in admin snapshot: %s", e)
             await query.edit_message_text(f"❌ Error during snapshot: {str(e)}")
     
     async def _handle_cleanup_data(self, query):
         """Handle cleanup data button"""
         try:
             logger.info("Cleanup data button clicked")
-            deleted_count = self.snapshot_service.cleanup_old_snapshots()
+            deleted_count = await self._db(self.snapshot_service.cleanup_old_snapshots)
             
-            message = f"🧹 **Data Cleanup Completed**\n\n"
-            message += f"**Deleted snapshots:** {deleted_count} (older than 90 days)\n"
+            message = f"🧹 <b>Data Cleanup Completed</b>\n\n"
+            message += f"<b>Deleted snapshots:</b> {deleted_count} (older than 90 days)\n"
             message += "This helps maintain database performance."
             
-            await query.edit_message_text(message, parse_mode='Markdown')
-            logger.info(f"Data cleanup completed, deleted {deleted_count} snapshots")
+            await query.edit_message_text(message, parse_mode=ParseMode.HTML)
+            logger.info("Data cleanup completed, deleted %s snapshots", deleted_count)
             
         except Exception as e:
-            logger.error(f"Error in cleanup: {e}")
+            logger.error("Error in cleanup: %s", e)
             await query.edit_message_text("❌ Error during cleanup.")
     
     async def _handle_validate_data(self, query):
         """Handle validate data button"""
         try:
             logger.info("Validate data button clicked")
-            validation = self.snapshot_service.validate_snapshot_data()
+            validation = await self._db(self.snapshot_service.validate_snapshot_data)
             
-            message = "✅ **Data Validation Results**\n\n"
+            message = "✅ <b>Data Validation Results</b>\n\n"
             
             if validation['is_valid']:
-                message += "**Status:** All data is valid! 🎉\n"
+                message += "<b>Status:</b> All data is valid! 🎉\n"
                 logger.info("Data validation passed")
             else:
-                message += "**Status:** Issues found ❌\n"
-                message += f"**Holders without snapshots:** {validation.get('holders_without_snapshots', 0)}\n"
-                message += f"**Orphaned snapshots:** {validation.get('orphaned_snapshots', 0)}\n"
-                logger.warning(f"Data validation failed: {validation}")
+                message += "<b>Status:</b> Issues found ❌\n"
+                message += f"<b>Holders without snapshots:</b> {validation.get('holders_without_snapshots', 0)}\n"
+                message += f"<b>Orphaned snapshots:</b> {validation.get('orphaned_snapshots', 0)}\n"
+                logger.warning("Data validation failed: %s", validation)
             
-            await query.edit_message_text(message, parse_mode='Markdown')
+            await query.edit_message_text(message, parse_mode=ParseMode.HTML)
             
         except Exception as e:
-            logger.error(f"Error in validation: {e}")
+            logger.error("Error in validation: %s", e)
             await query.edit_message_text("❌ Error during validation.")
     
     async def _handle_admin_set_price(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin setting token price"""
         try:
-            message = "💵 **Set Token Price**\n\n"
+            message = "💵 <b>Set Token Price</b>\n\n"
             message += "Please send the token price in USD.\n"
-            message += "Example: `0.00000123` or `1.23`\n\n"
+            message += "Example: <code>0.00000123</code> or <code>1.23</code>\n\n"
             message += "This will be used for USD calculations until the next snapshot."
             
             # Store state for price input
             context.user_data['awaiting_price_input'] = True
             
-            await update.callback_query.edit_message_text(message, parse_mode='Markdown')
+            await update.callback_query.edit_message_text(message, parse_mode=ParseMode.HTML)
             logger.info("Admin price input requested")
             
         except Exception as e:
-            logger.error(f"Error in admin set price: {e}")
+            logger.error("Error in admin set price: %s", e)
             await update.callback_query.answer("Error setting price")
     
     async def _handle_admin_manual_snapshot(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin manual snapshot"""
         try:
-            await update.callback_query.answer("Starting manual snapshot...")
+            if not self._start_snapshot(self._run_admin_snapshot(update.callback_query), update):
+                await update.callback_query.edit_message_text("⏳ Snapshot already in progress.")
+                return
             
-            # Start snapshot in background
-            import threading
-            snapshot_thread = threading.Thread(target=self.snapshot_service.take_daily_snapshot)
-            snapshot_thread.start()
+            await update.callback_query.answer("Starting manual snapshot...")
             
             await update.callback_query.edit_message_text(
-                "🔄 **Manual Snapshot Started**\n\n"
+                "🔄 <b>Manual Snapshot Started</b>\n\n"
                 "Snapshot is running in the background.\n"
-                "Check logs for progress updates."
+                "This message will update when it finishes.",
+                parse_mode=ParseMode.HTML
             )
             logger.info("Manual snapshot started by admin")
             
         except Exception as e:
-            logger.error(f"Error starting manual snapshot: {e}")
+            logger.error("Error starting manual snapshot: %s", e)
             await update.callback_query.answer("Error starting snapshot")
     
     async def _handle_admin_view_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin viewing bot stats"""
         try:
-            stats = self.db.get_bot_stats()
+            stats = await self._db(self.db.get_bot_stats)
             
-            message = "📊 **Bot Statistics**\n\n"
-            message += f"**Total Holders:** {stats.get('total_holders', 0)}\n"
-            message += f"**Total Snapshots:** {stats.get('total_snapshots', 0)}\n"
-            message += f"**Last Snapshot:** {stats.get('last_snapshot', 'Never')}\n"
-            message += f"**Min USD Threshold:** ${stats.get('min_usd_threshold', 0):.2f}\n"
-            message += f"**Database Size:** {stats.get('db_size', 'Unknown')}\n"
+            message = "📊 <b>Bot Statistics</b>\n\n"
+            message += f"<b>Total Holders:</b> {stats.get('total_holders', 0)}\n"
+            message += f"<b>Total Snapshots:</b> {stats.get('total_snapshots', 0)}\n"
+            message += f"<b>Last Snapshot:</b> {stats.get('last_snapshot', 'Never')}\n"
+            message += f"<b>Min USD Threshold:</b> ${stats.get('min_usd_threshold', 0):.2f}\n"
+            message += f"<b>Database Size:</b> {stats.get('db_size', 'Unknown')}\n"
             
-            await update.callback_query.edit_message_text(message, parse_mode='Markdown')
+            await update.callback_query.edit_message_text(message, parse_mode=ParseMode.HTML)
             logger.info("Admin stats displayed")
             
         except Exception as e:
-            logger.error(f"Error displaying admin stats: {e}")
+            logger.error("Error displaying admin stats: %s", e)
             await update.callback_query.answer("Error displaying stats")
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle incoming messages"""
         try:
             # Check if admin is setting price
-            if context.user_data.get('awaiting_price_input') and self._is_admin(update.effective_user.id):
+            if context.user_data.get('awaiting_price_input') and update.effective_user.id in self._admin_ids:
                 await self._handle_price_input(update, context)
                 return
             
@@ -548,7 +757,7 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
             return
             
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
     
     async def _handle_price_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin price input"""
@@ -562,30 +771,26 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
                     await update.message.reply_text("❌ Price must be greater than 0.")
                     return
             except ValueError:
-                await update.message.reply_text("❌ Invalid price format. Please send a number like `0.00000123`")
+                await update.message.reply_text("❌ Invalid price format. Please send a number like <code>0.00000123</code>", parse_mode=ParseMode.HTML)
                 return
             
             # Store the price for next snapshot
             context.user_data['manual_token_price'] = price
             context.user_data['awaiting_price_input'] = False
             
-            message = f"✅ **Token Price Set**\n\n"
-            message += f"Price: **${price:.8f}**\n\n"
+            message = f"✅ <b>Token Price Set</b>\n\n"
+            message += f"Price: <b>${price:.8f}</b>\n\n"
             message += "This price will be used for the next snapshot.\n"
-            message += "Run `/snapshot` to apply the new price immediately."
+            message += "Run <code>/snapshot</code> to apply the new price immediately."
             
-            await update.message.reply_text(message, parse_mode='Markdown')
-            logger.info(f"Admin set manual token price: ${price}")
+            await update.message.reply_text(message, parse_mode=ParseMode.HTML)
+            logger.info("Admin set manual token price: $%s", price)
             
         except Exception as e:
-            logger.error(f"Error handling price input: {e}")
+            logger.error("Error handling price input: %s", e)
             await update.message.reply_text("❌ Error setting price. Please try again.")
             context.user_data['awaiting_price_input'] = False
     
-    def _is_admin(self, user_id: int) -> bool:
-        """Check if user is admin"""
-        return user_id in Config.ADMIN_USER_IDS
-    
     def run(self):
         """Start the bot"""
         logger.info("Starting Token Holder Bot...")
@@ -593,28 +798,63 @@ The bot takes daily snapshots to track how long each wallet has held tokens. The
             # Run the bot in the current event loop
             self.application.run_polling()
         except Exception as e:
-            logger.error(f"Error running bot: {e}")
+            logger.error("Error running bot: %s", e)
             raise
     
-    def stop(self):
-        """Stop the bot and close connections"""
-        logger.info("Stopping Token Holder Bot...")
+    async def run_async(self, until):
+        """Poll for updates on the running event loop until `until` completes
+        
+        Unlike run() this does not own the loop or install signal handlers,
+        so other services (e.g. the health server) can share the loop.
+        """
+        logger.info("Starting Token Holder Bot...")
+        async with self.application:
+            await self.application.start()
+            await self.application.updater.start_polling()
+            try:
+                await until
+            finally:
+                await self.application.updater.stop()
+                await self.application.stop()
+    
+    async def _post_shutdown(self, application: Application):
+        """Release connections once the application has shut down"""
+        self._close_connections()
+    
+    def _close_connections(self):
+        """Close the snapshot service and database connections"""
         try:
-            # Stop the application
-            if hasattr(self.application, 'stop'):
-                self.application.stop()
+            self.snapshot_service.close()
         except Exception as e:
-            logger.error(f"Error stopping bot: {e}")
+            logger.error("Error closing snapshot service: %s", e)
         finally:
-            self.snapshot_service.close()
             self.db.close()
+    
+    def stop(self):
+        """Stop the bot and close connections
+        
+        run_polling() stops and shuts down the application itself on
+        SIGINT/SIGTERM, which triggers _post_shutdown. run_async() leaves
+        connection cleanup to this method, which is also safe to call if
+        polling was never started.
+        """
+        logger.info("Stopping Token Holder Bot...")
+        self._close_connections()
 
 if __name__ == "__main__":
+    # run_polling() creates its loop from the current policy, so switch to
+    # uvloop first when it is available (main.py does the same via uvloop.run)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Validate configuration
     try:
         Config.validate()
         bot = TokenHolderBot()
         bot.run()
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
         exit(1)
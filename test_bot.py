@@ -6,13 +6,45 @@ This script tests the basic functionality of the bot components
 without actually starting the Telegram bot.
 """
 
+import io
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+class _PerThreadStdout:
+    """sys.stdout stand-in that buffers prints from threads running a check
+    
+    Each check's output is written out in one go when it finishes, so
+    concurrent checks don't interleave and don't flush line by line.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        return (buf or self.stream).write(text)
+    
+    def flush(self):
+        if getattr(self._local, 'buf', None) is None:
+            self.stream.flush()
+    
+    def start(self):
+        self._local.buf = io.StringIO()
+    
+    def finish(self):
+        buf, self._local.buf = self._local.buf, None
+        with self._lock:
+            self.stream.write(buf.getvalue())
+            self.stream.flush()
+
 def test_config():
     """Test configuration loading"""
     print("🔧 Testing Configuration...")
@@ -110,28 +142,49 @@ def test_scheduler():
         print(f"❌ Scheduler error: {e}")
         return False
 
+def run_test(test):
+    """Run one test, treating an unexpected exception as a failure"""
+    stdout = sys.stdout
+    buffered = isinstance(stdout, _PerThreadStdout)
+    if buffered:
+        stdout.start()
+    try:
+        return bool(test())
+    except Exception as e:
+        print(f"❌ Test failed with exception: {e}")
+        return False
+    finally:
+        if buffered:
+            stdout.finish()
+
+def run_group(tests):
+    """Run tests one after another, returning how many passed"""
+    return sum(run_test(test) for test in tests)
+
 def main():
     """Run all tests"""
     print("🚀 Token Holder Bot - Component Tests\n")
     print("=" * 50)
     
-    tests = [
-        test_config,
-        test_database,
-        test_solscan_api,
-        test_snapshot_service,
-        test_scheduler
+    # Each group runs on its own thread; checks within a group run in order.
+    # Everything that constructs Database() shares a group, because its
+    # schema setup and snapshots partition migration must not run twice
+    # at once (main.py starts these components one after another too)
+    groups = [
+        [test_config],
+        [test_solscan_api],
+        [test_database, test_snapshot_service, test_scheduler]
     ]
     
-    passed = 0
-    total = len(tests)
+    total = sum(len(group) for group in groups)
     
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-        except Exception as e:
-            print(f"❌ Test failed with exception: {e}")
+    stdout = sys.stdout
+    sys.stdout = _PerThreadStdout(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            passed = sum(executor.map(run_group, groups))
+    finally:
+        sys.stdout = stdout
     
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -144,5 +197,11 @@ def main():
         return False
 
 if __name__ == "__main__":
+    # `--warm` compiles the project's .pyc files up front, in parallel, so
+    # the checks below only pay for unmarshalling their imports
+    if "--warm" in sys.argv:
+        import compileall
+        compileall.compile_dir(os.path.dirname(os.path.abspath(__file__)), quiet=1, workers=0)
+    
     success = main()
     sys.exit(0 if success else 1)